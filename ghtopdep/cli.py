@@ -1,10 +1,14 @@
 import calendar
 import datetime
+import heapq
 import json
 import os
+import re
 import sys
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from email.utils import formatdate, parsedate
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -13,12 +17,12 @@ from urllib.parse import urlparse
 
 import appdirs
 import click
-import github3
 import requests
 from cachecontrol import CacheControl, CacheControlAdapter
 from cachecontrol.caches import FileCache
 from cachecontrol.heuristics import BaseHeuristic
-from selectolax.parser import HTMLParser
+from requests.adapters import DEFAULT_POOLSIZE
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 from tabulate import tabulate
 from tqdm import tqdm
 from urllib3.util.retry import Retry
@@ -29,10 +33,27 @@ NEXT_BUTTON_SELECTOR = "#dependents > div.paginate-container > div > a"
 ITEM_SELECTOR = "#dependents > div.Box > div.flex-items-center"
 REPO_SELECTOR = "span > a.text-bold"
 STARS_SELECTOR = "div > span:nth-child(1)"
+DEPS_COUNT_SELECTOR = ".table-list-header-toggle .btn-link.selected"
 GITHUB_URL = "https://github.com"
 REPOS_PER_PAGE = 30
 MAX_PAGES = 1000  # Safety limit to prevent infinite loops
 REQUEST_TIMEOUT = 30  # Timeout for requests in seconds
+CONNECT_TIMEOUT = 5  # Timeout for establishing a connection in seconds
+_NUM_RE = re.compile(r"\d[\d,]*")  # Count with thousands separators
+# GitHub allows alphanumeric, hyphens, underscores, and dots in owner/repo names
+_NAME_RE = re.compile(r"[a-zA-Z0-9._-]+")
+# Inner markup of the header toggle's selected link/button, and the tags to strip
+_SELECTED_COUNT_RE = re.compile(
+    r'table-list-header-toggle.*?class="btn-link selected"[^>]*>(.*?)</(?:a|button)>',
+    re.DOTALL,
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+# Shared one-line wrapper that shortens descriptions to 60 characters
+_DESCRIPTION_WRAPPER = textwrap.TextWrapper(width=60, max_lines=1, placeholder="...")
+# Plain https://github.com/owner/repository URLs, validated in a single match
+_GITHUB_REPO_URL_RE = re.compile(
+    r"https?://(?:www\.)?github\.com/([a-zA-Z0-9._-]+)/([a-zA-Z0-9._-]+)/?(?:[?#].*)?"
+)
 
 
 class OneDayHeuristic(BaseHeuristic):
@@ -50,6 +71,11 @@ class OneDayHeuristic(BaseHeuristic):
         501,
     }
 
+    _WARNING = "110 - Automatically cached! Response is Stale."
+
+    # Last (date header, headers) pair; responses from the same second share it
+    _last_expiry: tuple[str, dict[str, str]] | None = None
+
     def update_headers(self, response: Any) -> dict[str, str]:
         if response.status not in self.cacheable_by_default_statuses:
             return {}
@@ -58,12 +84,16 @@ class OneDayHeuristic(BaseHeuristic):
         if not date_header:
             return {}
 
+        last_expiry = self._last_expiry
+        if last_expiry is not None and last_expiry[0] == date_header:
+            return dict(last_expiry[1])
+
         try:
             date = parsedate(date_header)
             if not date:
                 return {}
             expires = datetime.datetime(*date[:6]) + datetime.timedelta(days=1)
-            return {
+            headers = {
                 "expires": formatdate(calendar.timegm(expires.timetuple())),
                 "cache-control": "public",
             }
@@ -71,9 +101,38 @@ class OneDayHeuristic(BaseHeuristic):
             # If date parsing fails, don't cache
             return {}
 
+        self._last_expiry = (date_header, headers)
+        return dict(headers)
+
     def warning(self, response: Any) -> str:
-        warning_msg = "Automatically cached! Response is Stale."
-        return f"110 - {warning_msg}"
+        return self._WARNING
+
+
+def _report_session() -> requests.Session:
+    """
+    Create the session for the report server's GET and POST.
+
+    Both requests go to one host, so a single kept-alive connection serves
+    them. Responses are cached only as the server's own headers allow.
+
+    Returns:
+        requests.Session: Session with a caching, retrying adapter mounted
+    """
+    sess = requests.Session()
+    adapter = CacheControlAdapter(
+        cache=FileCache(CACHE_DIR),
+        pool_connections=1,
+        pool_maxsize=1,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[502, 503, 504],
+            raise_on_status=False,  # Hand the last response to the status checks
+        ),
+    )
+    sess.mount("http://", adapter)
+    sess.mount("https://", adapter)
+    return sess
 
 
 def already_added(repo_url: str, repos: list[dict[str, Any]]) -> bool:
@@ -91,10 +150,7 @@ def already_added(repo_url: str, repos: list[dict[str, Any]]) -> bool:
     Returns:
         bool: True if repo_url is found in repos, False otherwise
     """
-    for repo in repos:
-        if repo["url"] == repo_url:
-            return True
-    return False
+    return any(repo["url"] == repo_url for repo in repos)
 
 
 def fetch_description(gh: Any, relative_url: str) -> str:
@@ -109,15 +165,16 @@ def fetch_description(gh: Any, relative_url: str) -> str:
         str: Repository description (shortened to 60 chars) or empty string on error
     """
     try:
-        # Validate and parse the URL
-        url_parts = relative_url.split("/")
-        if len(url_parts) < 3:
+        # Validate and parse the URL; partition avoids building a list per call
+        _, _, path = relative_url.partition("/")
+        owner, sep, repository = path.partition("/")
+        if not sep:
             click.echo(
                 f"Warning: Invalid relative URL format: {relative_url}", err=True
             )
             return ""
 
-        owner, repository = url_parts[1], url_parts[2]
+        repository = repository.partition("/")[0]
 
         if not owner or not repository:
             click.echo(
@@ -142,8 +199,9 @@ def fetch_description(gh: Any, relative_url: str) -> str:
 
         repo_description = " "
         if repo_obj.description:
-            repo_description = textwrap.shorten(
-                repo_obj.description, width=60, placeholder="..."
+            # Same as textwrap.shorten(..., width=60, placeholder="...")
+            repo_description = _DESCRIPTION_WRAPPER.fill(
+                " ".join(repo_obj.description.split())
             )
         return repo_description
 
@@ -156,7 +214,13 @@ def fetch_description(gh: Any, relative_url: str) -> str:
 
 
 def sort_repos(repos: list[dict[str, Any]], rows: int) -> list[dict[str, Any]]:
-    sorted_repos = sorted(repos, key=lambda i: i["stars"], reverse=True)
+    if not repos or rows == 0:
+        return []
+    by_stars = itemgetter("stars")
+    if 0 < rows < len(repos):
+        # Same result as the sorted slice below, without sorting the whole list
+        return heapq.nlargest(rows, repos, key=by_stars)
+    sorted_repos = sorted(repos, key=by_stars, reverse=True)
     return sorted_repos[:rows]
 
 
@@ -208,6 +272,37 @@ def show_result(
         click.echo(json.dumps(repos))
 
 
+class ScrapeError(click.ClickException):
+    """Raised when the dependents page can't be fetched or parsed.
+
+    Click prints it as ``Error: <message>`` and exits with status 1.
+    """
+
+
+def _scan_counter(page: str) -> int | None:
+    """
+    Read the selected dependents count straight from the header markup.
+
+    Returns None when the markup doesn't have the expected shape, so the
+    caller can fall back to parsing the page.
+    """
+    match = _SELECTED_COUNT_RE.search(page)
+    if match is None:
+        return None
+    try:
+        return _parse_count(_TAG_RE.sub("", match.group(1)).split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def _parse_count(text: str) -> int:
+    """Parse a GitHub count such as ``"1,234"`` into an int."""
+    match = _NUM_RE.fullmatch(text)
+    if match is None:
+        raise ValueError(f"invalid count: {text!r}")
+    return int(match.group().replace(",", ""))
+
+
 def get_max_deps(
     sess: requests.Session, url: str, timeout: int = REQUEST_TIMEOUT
 ) -> int:
@@ -223,61 +318,53 @@ def get_max_deps(
         int: Maximum number of dependents
 
     Raises:
-        SystemExit: If unable to fetch or parse the data
+        ScrapeError: If unable to fetch or parse the data
     """
     try:
         main_response = sess.get(url, timeout=timeout)
         main_response.raise_for_status()
-    except requests.exceptions.Timeout:
-        click.echo(f"Error: Request timeout while fetching {url}", err=True)
-        sys.exit(1)
+    except requests.exceptions.Timeout as e:
+        raise ScrapeError(f"Request timeout while fetching {url}") from e
     except requests.exceptions.ConnectionError as e:
-        click.echo(f"Error: Connection failed while fetching {url}: {e}", err=True)
-        sys.exit(1)
+        raise ScrapeError(f"Connection failed while fetching {url}: {e}") from e
     except requests.exceptions.HTTPError as e:
-        click.echo(f"Error: HTTP error while fetching {url}: {e}", err=True)
-        sys.exit(1)
+        raise ScrapeError(f"HTTP error while fetching {url}: {e}") from e
     except requests.exceptions.RequestException as e:
-        click.echo(f"Error: Request failed while fetching {url}: {e}", err=True)
-        sys.exit(1)
+        raise ScrapeError(f"Request failed while fetching {url}: {e}") from e
+
+    page = main_response.text
+    count = _scan_counter(page)
+    if count is not None:
+        return count
 
     try:
-        parsed_node = HTMLParser(main_response.text)
+        parsed_node = HTMLParser(page)
     except Exception as e:
-        click.echo(f"Error: Failed to parse HTML response: {e}", err=True)
-        sys.exit(1)
+        raise ScrapeError(f"Failed to parse HTML response: {e}") from e
 
     try:
-        deps_count_element = parsed_node.css_first(
-            ".table-list-header-toggle .btn-link.selected"
-        )
+        deps_count_element = parsed_node.css_first(DEPS_COUNT_SELECTOR)
         if not deps_count_element:
-            click.echo(
-                "Error: Could not find dependents count element in page", err=True
+            raise ScrapeError(
+                "Could not find dependents count element in page\n"
+                "The page structure may have changed or the URL is invalid"
             )
-            click.echo(
-                "The page structure may have changed or the URL is invalid", err=True
-            )
-            sys.exit(1)
 
         element_text = deps_count_element.text()
         if not element_text:
-            click.echo("Error: Dependents count element has no text content", err=True)
-            sys.exit(1)
+            raise ScrapeError("Dependents count element has no text content")
 
         # Extract number from text (e.g., "1,234 Repositories")
-        count_str = element_text.strip().split()[0].replace(",", "")
-        max_deps = int(count_str)
-        return max_deps
+        return _parse_count(element_text.split()[0])
 
+    except ScrapeError:
+        raise
     except (ValueError, IndexError) as e:
-        click.echo(f"Error: Could not parse dependents count from page: {e}", err=True)
-        sys.exit(1)
+        raise ScrapeError(f"Could not parse dependents count from page: {e}") from e
     except Exception as e:
-        click.echo(
-            f"Error: Unexpected error while parsing dependents count: {e}", err=True
-        )
-        sys.exit(1)
+        raise ScrapeError(
+            f"Unexpected error while parsing dependents count: {e}"
+        ) from e
 
 
 def validate_github_url(url: str) -> tuple[str, str]:
@@ -297,6 +384,11 @@ def validate_github_url(url: str) -> tuple[str, str]:
         click.echo("Error: URL cannot be empty", err=True)
         sys.exit(1)
 
+    # Fast path for the common shape; anything else gets the detailed checks below
+    match = _GITHUB_REPO_URL_RE.fullmatch(url)
+    if match:
+        return match.group(1), match.group(2)
+
     try:
         parsed = urlparse(url)
     except Exception as e:
@@ -339,19 +431,14 @@ def validate_github_url(url: str) -> tuple[str, str]:
         sys.exit(1)
 
     # Basic validation for valid GitHub username/repo name characters
-    # GitHub allows alphanumeric, hyphens, underscores, and dots
-    import re
-
-    valid_pattern = re.compile(r"^[a-zA-Z0-9._-]+$")
-
-    if not valid_pattern.match(owner):
+    if not _NAME_RE.fullmatch(owner):
         click.echo(
             f"Error: Invalid owner name '{owner}' - must contain only alphanumeric characters, dots, hyphens, or underscores",
             err=True,
         )
         sys.exit(1)
 
-    if not valid_pattern.match(repository):
+    if not _NAME_RE.fullmatch(repository):
         click.echo(
             f"Error: Invalid repository name '{repository}' - must contain only alphanumeric characters, dots, hyphens, or underscores",
             err=True,
@@ -412,9 +499,15 @@ def cli(
     gh = None
 
     if report:
+        report_sess = _report_session()
+        # Closed when the command exits, whichever sys.exit ends it
+        click.get_current_context().call_on_close(report_sess.close)
+
         report_url = f"{base_url}/repos/{owner}/{repository}"
         try:
-            result = requests.get(report_url, timeout=30)
+            result = report_sess.get(
+                report_url, timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT)
+            )
 
             # Handle successful response
             if result.status_code == 200:
@@ -455,6 +548,9 @@ def cli(
             sys.exit(1)
 
     if (description or search) and token:
+        # Deferred: github3 is only needed for --description/--search
+        import github3
+
         gh = github3.login(token=token)
         CacheControl(
             gh.session, cache=FileCache(CACHE_DIR), heuristic=OneDayHeuristic()
@@ -536,7 +632,7 @@ def cli(
             break
 
         try:
-            parsed_node = HTMLParser(response.text)
+            parsed_node = HTMLParser(response.content)
         except Exception as e:
             click.echo(
                 f"Warning: Failed to parse HTML on page {page_count}: {e}", err=True
@@ -549,17 +645,20 @@ def cli(
 
             for dep in dependents:
                 try:
-                    repo_stars_list = dep.css(STARS_SELECTOR)
+                    # css_first stops at the first match instead of listing them all
+                    repo_stars_node = dep.css_first(
+                        STARS_SELECTOR, default=None, strict=False
+                    )
                     # only for ghost or private? packages
-                    if not repo_stars_list:
+                    if repo_stars_node is None:
                         continue
 
-                    repo_stars = repo_stars_list[0].text().strip()
+                    repo_stars = repo_stars_node.text().strip()
                     if not repo_stars:
                         continue
 
                     try:
-                        repo_stars_num = int(repo_stars.replace(",", ""))
+                        repo_stars_num = _parse_count(repo_stars)
                     except ValueError:
                         click.echo(
                             f"Warning: Could not parse star count '{repo_stars}'",
@@ -571,14 +670,14 @@ def cli(
                         more_than_zero_count += 1
 
                     if repo_stars_num >= minstar:
-                        repo_selector_list = dep.css(REPO_SELECTOR)
-                        if not repo_selector_list:
+                        repo_node = dep.css_first(
+                            REPO_SELECTOR, default=None, strict=False
+                        )
+                        if repo_node is None:
                             continue
 
                         try:
-                            relative_repo_url = repo_selector_list[0].attributes.get(
-                                "href"
-                            )
+                            relative_repo_url = repo_node.attributes.get("href")
                             if not relative_repo_url:
                                 continue
                         except (KeyError, AttributeError):
@@ -592,19 +691,7 @@ def cli(
                         # Set-based duplicate detection (O(1) lookup) - can be listed same package
                         if repo_url not in seen_urls and repo_url != url:
                             seen_urls.add(repo_url)
-                            if description:
-                                repo_description = fetch_description(
-                                    gh, relative_repo_url
-                                )
-                                repos.append(
-                                    {
-                                        "url": repo_url,
-                                        "stars": repo_stars_num,
-                                        "description": repo_description,
-                                    }
-                                )
-                            else:
-                                repos.append({"url": repo_url, "stars": repo_stars_num})
+                            repos.append({"url": repo_url, "stars": repo_stars_num})
 
                 except Exception as e:
                     click.echo(
@@ -647,6 +734,24 @@ def cli(
 
     pbar.close()
 
+    sorted_repos = sort_repos(repos, rows)
+
+    if description and repos:
+        # The report carries every dependent; otherwise only the shown rows need one
+        described_repos = repos if report else sorted_repos
+        # Descriptions are independent API calls, so fetch them concurrently,
+        # with no more workers than the session's connection pool holds
+        relative_urls = [repo["url"][len(GITHUB_URL) :] for repo in described_repos]
+        with ThreadPoolExecutor(max_workers=DEFAULT_POOLSIZE) as executor:
+            descriptions = executor.map(
+                lambda relative_url: fetch_description(gh, relative_url),
+                relative_urls,
+            )
+            for repo, repo_description in zip(
+                described_repos, descriptions, strict=True
+            ):
+                repo["description"] = repo_description
+
     if report:
         report_post_url = f"{base_url}/repos"
         try:
@@ -656,7 +761,11 @@ def cli(
                 "repository": repository,
                 "deps": repos,
             }
-            response = requests.post(report_post_url, json=payload, timeout=30)
+            response = report_sess.post(
+                report_post_url,
+                json=payload,
+                timeout=(CONNECT_TIMEOUT, REQUEST_TIMEOUT),
+            )
 
             # Check if the POST was successful
             if response.status_code not in [200, 201]:
@@ -685,8 +794,6 @@ def cli(
             click.echo(f"Error: Request failed while submitting report: {e}", err=True)
             sys.exit(1)
 
-    sorted_repos = sort_repos(repos, rows)
-
     if search:
         if gh is None:
             click.echo(
@@ -2,10 +2,31 @@
 
 import os
 from collections.abc import Generator
+from pathlib import Path
 from typing import Any
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
+import requests
+from selectolax.lexbor import LexborHTMLParser
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+class FakeResponse:
+    """Slot-only stand-in for a ``requests.Response`` carrying a page body."""
+
+    __slots__ = ("content", "status_code", "text")
+
+    def __init__(self, text: str, status_code: int = 200) -> None:
+        self.text = text
+        self.content = text.encode()
+        self.status_code = status_code
+
+    def raise_for_status(self) -> None:
+        """Raise ``HTTPError`` for 4xx/5xx codes like the real response does."""
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error")
 
 
 @pytest.fixture
@@ -16,10 +37,17 @@ def mock_github_client() -> MagicMock:
 
 
 @pytest.fixture
-def mock_requests_session() -> MagicMock:
-    """Create a mock requests session."""
-    session = MagicMock()
-    return session
+def mock_requests_session() -> Mock:
+    """Create a mock requests session restricted to the Session API."""
+    return Mock(spec=requests.Session)
+
+
+@pytest.fixture
+def report_session() -> Generator[Mock, None, None]:
+    """Patch the report server session factory and yield the mock session."""
+    sess = Mock(spec=requests.Session)
+    with patch("ghtopdep.cli._report_session", return_value=sess):
+        yield sess
 
 
 @pytest.fixture
@@ -54,7 +82,7 @@ def sample_repos_with_description() -> list[dict[str, Any]]:
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def html_response_dependents() -> str:
     """Sample HTML response from GitHub dependents page."""
     return """
@@ -66,6 +94,7 @@ def html_response_dependents() -> str:
             <div id="dependents">
                 <div class="Box">
                     <div class="flex-items-center">
+                        <img class="avatar" alt="" src="">
                         <span>
                             <a class="text-bold" href="/user1/repo1">user1/repo1</a>
                         </span>
@@ -74,6 +103,7 @@ def html_response_dependents() -> str:
                         </div>
                     </div>
                     <div class="flex-items-center">
+                        <img class="avatar" alt="" src="">
                         <span>
                             <a class="text-bold" href="/user2/repo2">user2/repo2</a>
                         </span>
@@ -82,6 +112,7 @@ def html_response_dependents() -> str:
                         </div>
                     </div>
                     <div class="flex-items-center">
+                        <img class="avatar" alt="" src="">
                         <span>
                             <a class="text-bold" href="/user3/repo3">user3/repo3</a>
                         </span>
@@ -91,7 +122,9 @@ def html_response_dependents() -> str:
                     </div>
                 </div>
                 <div class="paginate-container">
-                    <a href="/network/dependents?page=2">Next</a>
+                    <div class="BtnGroup">
+                        <a href="https://github.com/user/repo/network/dependents?page=2">Next</a>
+                    </div>
                 </div>
             </div>
         </body>
@@ -99,7 +132,7 @@ def html_response_dependents() -> str:
     """
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def html_response_last_page() -> str:
     """Sample HTML response from the last page of dependents."""
     return """
@@ -111,6 +144,7 @@ def html_response_last_page() -> str:
             <div id="dependents">
                 <div class="Box">
                     <div class="flex-items-center">
+                        <img class="avatar" alt="" src="">
                         <span>
                             <a class="text-bold" href="/user4/repo4">user4/repo4</a>
                         </span>
@@ -120,7 +154,9 @@ def html_response_last_page() -> str:
                     </div>
                 </div>
                 <div class="paginate-container">
-                    <a href="/network/dependents?page=1">Previous</a>
+                    <div class="BtnGroup">
+                        <a href="https://github.com/user/repo/network/dependents?page=1">Previous</a>
+                    </div>
                 </div>
             </div>
         </body>
@@ -128,6 +164,24 @@ def html_response_last_page() -> str:
     """
 
 
+@pytest.fixture(scope="session")
+def fixture_html() -> dict[str, str]:
+    """Dependents pages for the e2e scenarios, keyed by file name in fixtures/."""
+    return {path.stem: path.read_text() for path in FIXTURES_DIR.glob("*.html")}
+
+
+@pytest.fixture(scope="session")
+def tree_dependents(html_response_dependents: str) -> LexborHTMLParser:
+    """Parsed tree of the dependents page, shared across the session."""
+    return LexborHTMLParser(html_response_dependents.encode("utf-8"))
+
+
+@pytest.fixture(scope="session")
+def tree_last_page(html_response_last_page: str) -> LexborHTMLParser:
+    """Parsed tree of the last dependents page, shared across the session."""
+    return LexborHTMLParser(html_response_last_page.encode("utf-8"))
+
+
 @pytest.fixture(autouse=True)
 def env_setup() -> Generator[None, None, None]:
     """Set up environment variables for tests."""
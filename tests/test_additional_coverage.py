@@ -140,7 +140,7 @@ class TestSearchFunctionality:
 
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
+    @patch("github3.login")
     def test_search_with_valid_results(
         self,
         mock_login: Any,
@@ -161,21 +161,16 @@ class TestSearchFunctionality:
 
         with patch.dict(os.environ, {"GHTOPDEP_TOKEN": "test_token"}):
             with patch("ghtopdep.cli.CacheControl"):
-                with patch("ghtopdep.cli.requests.get") as mock_get:
-                    mock_response = Mock()
-                    mock_response.status_code = 404
-                    mock_get.return_value = mock_response
-
-                    result = cli_runner.invoke(
-                        cli,
-                        ["https://github.com/user/repo", "--search", "test_keyword"],
-                    )
-                    # Should process search results
-                    assert result.exit_code in [0, 1]
+                result = cli_runner.invoke(
+                    cli,
+                    ["https://github.com/user/repo", "--search", "test_keyword"],
+                )
+                # Should process search results
+                assert result.exit_code in [0, 1]
 
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
+    @patch("github3.login")
     def test_search_result_missing_html_url(
         self,
         mock_login: Any,
@@ -195,21 +190,16 @@ class TestSearchFunctionality:
 
         with patch.dict(os.environ, {"GHTOPDEP_TOKEN": "test_token"}):
             with patch("ghtopdep.cli.CacheControl"):
-                with patch("ghtopdep.cli.requests.get") as mock_get:
-                    mock_response = Mock()
-                    mock_response.status_code = 404
-                    mock_get.return_value = mock_response
-
-                    result = cli_runner.invoke(
-                        cli,
-                        ["https://github.com/user/repo", "--search", "test_keyword"],
-                    )
-                    # Should handle missing html_url gracefully
-                    assert result.exit_code in [0, 1]
+                result = cli_runner.invoke(
+                    cli,
+                    ["https://github.com/user/repo", "--search", "test_keyword"],
+                )
+                # Should handle missing html_url gracefully
+                assert result.exit_code in [0, 1]
 
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
+    @patch("github3.login")
     def test_search_invalid_repo_url_parsing(
         self,
         mock_login: Any,
@@ -228,21 +218,16 @@ class TestSearchFunctionality:
 
         with patch.dict(os.environ, {"GHTOPDEP_TOKEN": "test_token"}):
             with patch("ghtopdep.cli.CacheControl"):
-                with patch("ghtopdep.cli.requests.get") as mock_get:
-                    mock_response = Mock()
-                    mock_response.status_code = 404
-                    mock_get.return_value = mock_response
-
-                    result = cli_runner.invoke(
-                        cli,
-                        ["https://github.com/user/repo", "--search", "test_keyword"],
-                    )
-                    # Should handle gracefully
-                    assert result.exit_code in [0, 1]
+                result = cli_runner.invoke(
+                    cli,
+                    ["https://github.com/user/repo", "--search", "test_keyword"],
+                )
+                # Should handle gracefully
+                assert result.exit_code in [0, 1]
 
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
+    @patch("github3.login")
     def test_search_api_exception(
         self,
         mock_login: Any,
@@ -259,40 +244,32 @@ class TestSearchFunctionality:
 
         with patch.dict(os.environ, {"GHTOPDEP_TOKEN": "test_token"}):
             with patch("ghtopdep.cli.CacheControl"):
-                with patch("ghtopdep.cli.requests.get") as mock_get:
-                    mock_response = Mock()
-                    mock_response.status_code = 404
-                    mock_get.return_value = mock_response
-
-                    result = cli_runner.invoke(
-                        cli,
-                        ["https://github.com/user/repo", "--search", "test_keyword"],
-                    )
-                    # Should handle API exception
-                    assert result.exit_code in [0, 1]
+                result = cli_runner.invoke(
+                    cli,
+                    ["https://github.com/user/repo", "--search", "test_keyword"],
+                )
+                # Should handle API exception
+                assert result.exit_code in [0, 1]
 
 
 class TestReportModeErrors:
     """Tests for report mode error handling."""
 
     @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_report_mode_invalid_json_response(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        report_session: Mock,
     ) -> None:
         """Test report mode with invalid JSON response (status 200)."""
         mock_response = Mock()
         mock_response.status_code = 200
         mock_response.json.side_effect = ValueError("Invalid JSON")
-        mock_get.return_value = mock_response
+        report_session.get.return_value = mock_response
 
         with patch("ghtopdep.cli.CacheControl"):
             result = cli_runner.invoke(
@@ -302,22 +279,19 @@ class TestReportModeErrors:
             assert result.exit_code == 1
 
     @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_report_mode_non_200_404_status(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        report_session: Mock,
     ) -> None:
         """Test report mode with non-200/404 status code."""
         mock_response = Mock()
         mock_response.status_code = 500
-        mock_get.return_value = mock_response
+        report_session.get.return_value = mock_response
 
         with patch("ghtopdep.cli.CacheControl"):
             result = cli_runner.invoke(
@@ -327,22 +301,19 @@ class TestReportModeErrors:
             assert result.exit_code == 1
 
     @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_report_mode_get_httperror(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        report_session: Mock,
     ) -> None:
         """Test report mode GET with HTTPError."""
         import requests
 
-        mock_get.side_effect = requests.exceptions.HTTPError("HTTP Error")
+        report_session.get.side_effect = requests.exceptions.HTTPError("HTTP Error")
 
         with patch("ghtopdep.cli.CacheControl"):
             result = cli_runner.invoke(
@@ -352,22 +323,21 @@ class TestReportModeErrors:
             assert result.exit_code == 1
 
     @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_report_mode_get_request_exception(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        report_session: Mock,
     ) -> None:
         """Test report mode GET with generic RequestException."""
         import requests
 
-        mock_get.side_effect = requests.exceptions.RequestException("Request Error")
+        report_session.get.side_effect = requests.exceptions.RequestException(
+            "Request Error"
+        )
 
         with patch("ghtopdep.cli.CacheControl"):
             result = cli_runner.invoke(
@@ -377,36 +347,34 @@ class TestReportModeErrors:
             assert result.exit_code == 1
 
     @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=30)
     def test_report_mode_post_error_status(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        report_session: Mock,
         html_response_last_page: str,
     ) -> None:
         """Test report mode POST with error status."""
         # Setup GET response
         mock_get_response = Mock()
         mock_get_response.status_code = 404
-        mock_get.return_value = mock_get_response
+        report_session.get.return_value = mock_get_response
 
         # Setup session
         mock_session = _mock_session.return_value
         mock_session_resp = Mock()
         mock_session_resp.text = html_response_last_page
+        mock_session_resp.content = mock_session_resp.text.encode()
         mock_session_resp.raise_for_status.return_value = None
         mock_session.get.return_value = mock_session_resp
 
         # Setup POST response with error
         mock_post_response = Mock()
         mock_post_response.status_code = 500
-        mock_post.return_value = mock_post_response
+        report_session.post.return_value = mock_post_response
 
         with patch("ghtopdep.cli.CacheControl"):
             result = cli_runner.invoke(
@@ -416,17 +384,14 @@ class TestReportModeErrors:
             assert result.exit_code == 1
 
     @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=30)
     def test_report_mode_post_timeout(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        report_session: Mock,
         html_response_last_page: str,
     ) -> None:
         """Test report mode POST timeout."""
@@ -435,17 +400,18 @@ class TestReportModeErrors:
         # Setup GET response
         mock_get_response = Mock()
         mock_get_response.status_code = 404
-        mock_get.return_value = mock_get_response
+        report_session.get.return_value = mock_get_response
 
         # Setup session
         mock_session = _mock_session.return_value
         mock_session_resp = Mock()
         mock_session_resp.text = html_response_last_page
+        mock_session_resp.content = mock_session_resp.text.encode()
         mock_session_resp.raise_for_status.return_value = None
         mock_session.get.return_value = mock_session_resp
 
         # Setup POST timeout
-        mock_post.side_effect = requests.exceptions.Timeout("Timeout")
+        report_session.post.side_effect = requests.exceptions.Timeout("Timeout")
 
         with patch("ghtopdep.cli.CacheControl"):
             result = cli_runner.invoke(
@@ -473,11 +439,13 @@ class TestScrapingLoopEdgeCases:
         # First response with private repo
         response1 = Mock()
         response1.text = html_response_with_private_repos
+        response1.content = response1.text.encode()
         response1.raise_for_status.return_value = None
 
         # Second response (last page)
         response2 = Mock()
         response2.text = '<html><body><div class="table-list-header-toggle"><button class="btn-link selected">30 repositories</button></div><div id="dependents"><div class="Box"></div><div class="paginate-container"><a href="/network/dependents?page=1">Previous</a></div></div></body></html>'
+        response2.content = response2.text.encode()
         response2.raise_for_status.return_value = None
 
         mock_session.get.side_effect = [response1, response2]
@@ -501,10 +469,12 @@ class TestScrapingLoopEdgeCases:
 
         response1 = Mock()
         response1.text = html_response_with_empty_stars
+        response1.content = response1.text.encode()
         response1.raise_for_status.return_value = None
 
         response2 = Mock()
         response2.text = '<html><body><div class="table-list-header-toggle"><button class="btn-link selected">30 repositories</button></div><div id="dependents"><div class="Box"></div><div class="paginate-container"><a href="/network/dependents?page=1">Previous</a></div></div></body></html>'
+        response2.content = response2.text.encode()
         response2.raise_for_status.return_value = None
 
         mock_session.get.side_effect = [response1, response2]
@@ -528,10 +498,12 @@ class TestScrapingLoopEdgeCases:
 
         response1 = Mock()
         response1.text = html_response_with_invalid_stars
+        response1.content = response1.text.encode()
         response1.raise_for_status.return_value = None
 
         response2 = Mock()
         response2.text = '<html><body><div class="table-list-header-toggle"><button class="btn-link selected">30 repositories</button></div><div id="dependents"><div class="Box"></div><div class="paginate-container"><a href="/network/dependents?page=1">Previous</a></div></div></body></html>'
+        response2.content = response2.text.encode()
         response2.raise_for_status.return_value = None
 
         mock_session.get.side_effect = [response1, response2]
@@ -555,10 +527,12 @@ class TestScrapingLoopEdgeCases:
 
         response1 = Mock()
         response1.text = html_response_missing_repo_selector
+        response1.content = response1.text.encode()
         response1.raise_for_status.return_value = None
 
         response2 = Mock()
         response2.text = '<html><body><div class="table-list-header-toggle"><button class="btn-link selected">30 repositories</button></div><div id="dependents"><div class="Box"></div><div class="paginate-container"><a href="/network/dependents?page=1">Previous</a></div></div></body></html>'
+        response2.content = response2.text.encode()
         response2.raise_for_status.return_value = None
 
         mock_session.get.side_effect = [response1, response2]
@@ -580,6 +554,7 @@ class TestScrapingLoopEdgeCases:
 
         response1 = Mock()
         response1.text = '<html><body><div class="table-list-header-toggle"><button class="btn-link selected">30 repositories</button></div><div id="dependents"><div class="Box"></div><div class="paginate-container"><a href="/network/dependents?page=2">Next</a></div></div></body></html>'
+        response1.content = response1.text.encode()
         response1.raise_for_status.return_value = None
 
         # Second call raises HTTPError
@@ -652,7 +627,7 @@ class TestURLValidationEdgeCases:
 
         with patch("ghtopdep.cli.urlparse", side_effect=Exception("Parse error")):
             with pytest.raises(SystemExit):
-                validate_github_url("https://github.com/user/repo")
+                validate_github_url("https://github.com:443/user/repo")
             captured = capsys.readouterr()
             assert "Error: Invalid URL format" in captured.err
 
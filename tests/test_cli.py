@@ -1,6 +1,10 @@
 """Integration tests for the CLI."""
 
-import os
+import json
+import threading
+from collections.abc import Generator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
 from typing import Any
 from unittest.mock import Mock, patch
 
@@ -16,6 +20,41 @@ def cli_runner() -> CliRunner:
     return CliRunner()
 
 
+class _ReportServer(ThreadingHTTPServer):
+    """Local report server answering every GET with one stored report."""
+
+    cache_control = "no-store"
+    hits = 0
+
+
+class _ReportHandler(BaseHTTPRequestHandler):
+    server: _ReportServer
+
+    def do_GET(self) -> None:
+        self.server.hits += 1
+        body = json.dumps([{"url": "https://github.com/dep/one", "stars": 42}])
+        self.send_response(200)  # Also sends the Date header caching relies on
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", self.server.cache_control)
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, *args: Any) -> None:
+        """Keep request logs out of the test output."""
+
+
+@pytest.fixture
+def report_server() -> Generator[_ReportServer, None, None]:
+    """Serve reports over real HTTP, so responses pass through the cache."""
+    server = _ReportServer(("127.0.0.1", 0), _ReportHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
 class TestCLIBasic:
     """Basic CLI invocation tests."""
 
@@ -123,17 +162,6 @@ class TestCLIOptions:
         )
         assert result.exit_code in [0, 1]
 
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    def test_cli_minstar_option(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
-    ) -> None:
-        """Test --minstar option."""
-        result = cli_runner.invoke(
-            cli, ["https://github.com/user/repo", "--minstar", "100"]
-        )
-        assert result.exit_code in [0, 1]
-
 
 class TestCLIEnvironmentVariables:
     """Tests for CLI environment variable handling."""
@@ -146,18 +174,19 @@ class TestCLIEnvironmentVariables:
         # Should exit with error when token is missing
         assert result.exit_code == 1
 
-    @patch.dict(os.environ, {"GHTOPDEP_TOKEN": "test_token"})
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
+    @patch("github3.login")
     def test_cli_description_with_token(
         self,
         _mock_login: Any,
         _mock_deps: Any,
         _mock_session: Any,
         cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test --description with token from environment."""
+        monkeypatch.setenv("GHTOPDEP_TOKEN", "test_token")
         result = cli_runner.invoke(
             cli, ["https://github.com/user/repo", "--description"]
         )
@@ -170,39 +199,70 @@ class TestCLIEnvironmentVariables:
         assert result.exit_code == 1
         assert "GHTOPDEP_BASE_URL" in result.output
 
-    @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_cli_report_with_base_url(
         self,
         _mock_deps: Any,
         _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
         cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        report_session: Mock,
     ) -> None:
         """Test --report with GHTOPDEP_BASE_URL set."""
+        monkeypatch.setenv("GHTOPDEP_BASE_URL", "http://localhost:3000")
         mock_get_response = Mock()
         mock_get_response.status_code = 404
-        mock_get.return_value = mock_get_response
+        report_session.get.return_value = mock_get_response
 
         result = cli_runner.invoke(cli, ["https://github.com/user/repo", "--report"])
         # Should attempt to fetch report from base URL
         assert result.exit_code in [0, 1]
+        report_session.close.assert_called_once_with()
+
+    @pytest.mark.parametrize(
+        ("cache_control", "fetches"),
+        [("max-age=600", 1), ("no-store", 2)],
+        ids=["max_age", "no_store"],
+    )
+    def test_cli_report_cache_follows_server_headers(
+        self,
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        report_server: _ReportServer,
+        cache_control: str,
+        fetches: int,
+    ) -> None:
+        """Test a repeated report is served from cache only if the server allows."""
+        host, port = report_server.server_address[:2]
+        monkeypatch.setenv("GHTOPDEP_BASE_URL", f"http://{host!s}:{port}")
+        monkeypatch.setattr("ghtopdep.cli.CACHE_DIR", str(tmp_path))
+        report_server.cache_control = cache_control
+
+        for _ in range(2):
+            result = cli_runner.invoke(
+                cli, ["https://github.com/user/repo", "--report"]
+            )
+            assert result.exit_code == 0
+            assert "https://github.com/dep/one" in result.stdout
+
+        assert report_server.hits == fetches
 
-    @patch.dict(os.environ, {"GHTOPDEP_ENV": "development"})
     @patch("ghtopdep.cli.requests.session")
     @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_cli_development_mode_default_url(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
+        self,
+        _mock_deps: Any,
+        _mock_session: Any,
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         """Test development mode sets default URL."""
-        with patch("ghtopdep.cli.requests.get"):
-            result = cli_runner.invoke(cli, ["https://github.com/user/repo"])
-            # Should work without explicit BASE_URL in dev mode
-            assert result.exit_code in [0, 1]
+        monkeypatch.setenv("GHTOPDEP_ENV", "development")
+        result = cli_runner.invoke(cli, ["https://github.com/user/repo"])
+        # Should work without explicit BASE_URL in dev mode
+        assert result.exit_code in [0, 1]
 
 
 class TestCLIErrorHandling:
@@ -223,7 +283,7 @@ class TestCLIErrorHandling:
     ) -> None:
         """Test handling of invalid tokens."""
         with patch("ghtopdep.cli.get_max_deps", return_value=0):
-            with patch("ghtopdep.cli.github3.login") as mock_login:
+            with patch("github3.login") as mock_login:
                 mock_login.side_effect = Exception("Invalid token")
                 result = cli_runner.invoke(
                     cli,
@@ -1,278 +1,309 @@
 """Additional tests to improve coverage of edge cases and main CLI logic."""
 
-import os
+import json
+from collections.abc import Generator
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock
 
 import pytest
+import responses
 from click.testing import CliRunner
-from selectolax.parser import HTMLParser
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
 
 from ghtopdep.cli import cli
+from tests.conftest import FakeResponse
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def cli_runner() -> CliRunner:
-    """Create a Click CLI runner."""
+    """Create a Click CLI runner shared by the tests in this module."""
     return CliRunner()
 
 
+# Selectors are scoped to a sub-node so matching only walks that subtree
+_DEPENDENT_ITEMS = "div.Box > div.flex-items-center"
+_SELECTED_COUNT = ".btn-link.selected"
+
+_EMPTY_PAGE = FakeResponse("<html></html>")
+
+
+@pytest.fixture(autouse=True, scope="module")
+def _stub_cachecontrol() -> Generator[None, None, None]:
+    """Keep CacheControl from wrapping sessions for every test in this module."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("ghtopdep.cli.CacheControl", lambda sess, **kwargs: sess)
+        yield
+
+
+def _stub_scraping(monkeypatch: pytest.MonkeyPatch, max_deps: int) -> None:
+    """Replace the scraping session and dependents count with cheap stand-ins."""
+    session = SimpleNamespace(
+        mount=lambda *a, **k: None, get=lambda *a, **k: _EMPTY_PAGE
+    )
+    monkeypatch.setattr("ghtopdep.cli.requests.session", lambda: session)
+    monkeypatch.setattr("ghtopdep.cli.get_max_deps", lambda *a, **k: max_deps)
+
+
 class TestHTMLParsing:
     """Tests for HTML parsing with realistic data."""
 
-    def test_parse_dependents_items(self, html_response_dependents: str) -> None:
+    def test_parse_dependents_items(self, tree_dependents: HTMLParser) -> None:
         """Test parsing HTML with dependent items."""
-        tree = HTMLParser(html_response_dependents)
-        deps = tree.css("#dependents > div.Box > div.flex-items-center")
-        # Should find dependent items
-        assert len(deps) >= 0  # May or may not find items depending on HTML structure
+        dependents = tree_dependents.css_first("#dependents")
+        assert dependents is not None
+        deps = dependents.css(_DEPENDENT_ITEMS)
+        assert len(deps) == 3
 
-    def test_parse_max_deps_count(self, html_response_dependents: str) -> None:
+    def test_parse_max_deps_count(self, tree_dependents: HTMLParser) -> None:
         """Test extracting max dependency count."""
-        tree = HTMLParser(html_response_dependents)
-        deps_count = tree.css_first(".table-list-header-toggle .btn-link.selected")
+        header = tree_dependents.css_first(".table-list-header-toggle")
+        assert header is not None
+        deps_count = header.css_first(_SELECTED_COUNT)
         assert deps_count is not None
         assert "repositories" in deps_count.text()
 
-    def test_parse_last_page_structure(self, html_response_last_page: str) -> None:
+    def test_parse_last_page_structure(self, tree_last_page: HTMLParser) -> None:
         """Test parsing last page structure."""
-        tree = HTMLParser(html_response_last_page)
-        # Should be able to parse last page HTML
-        deps_count = tree.css_first(".table-list-header-toggle .btn-link.selected")
-        assert deps_count is not None
+        header = tree_last_page.css_first(".table-list-header-toggle")
+        assert header is not None
+        assert header.css_first(_SELECTED_COUNT) is not None
 
 
-@pytest.fixture
-def mock_session_with_dependents(
-    html_response_dependents: str, html_response_last_page: str
-) -> MagicMock:
-    """Create a mock session that returns dependents pages."""
-    session = MagicMock()
-
-    # First call returns page 1, second call returns last page
-    response1 = Mock()
-    response1.text = html_response_dependents
-    response1.status_code = 200
-
-    response2 = Mock()
-    response2.text = html_response_last_page
-    response2.status_code = 200
-
-    session.get.side_effect = [response1, response2]
-    return session
-
-
-@patch("ghtopdep.cli.requests.session")
-@patch("ghtopdep.cli.github3")
+@responses.activate(assert_all_requests_are_fired=True)
 def test_cli_with_pagination(
-    _mock_github: Any,
-    mock_session_class: Any,
     cli_runner: CliRunner,
-    mock_session_with_dependents: MagicMock,
+    html_response_dependents: str,
+    html_response_last_page: str,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
 ) -> None:
-    """Test CLI processes paginated results."""
-    mock_session_class.return_value = mock_session_with_dependents
-
-    with patch("ghtopdep.cli.get_max_deps", return_value=60):
-        with patch("ghtopdep.cli.CacheControl"):
-            result = cli_runner.invoke(cli, ["https://github.com/user/repo", "--json"])
-            # Should successfully process paginated results
-            assert result.exit_code in [0, 1]
+    """Test CLI walks every dependents page through a real requests session."""
+    monkeypatch.setattr("ghtopdep.cli.CACHE_DIR", str(tmp_path))
+    responses.add(
+        responses.GET,
+        "https://github.com/user/repo/network/dependents?dependent_type=REPOSITORY",
+        body=html_response_dependents,
+    )
+    responses.add(
+        responses.GET,
+        "https://github.com/user/repo/network/dependents?page=2",
+        body=html_response_last_page,
+    )
+
+    result = cli_runner.invoke(cli, ["https://github.com/user/repo", "--json"])
+
+    assert result.exit_code == 0
+    # get_max_deps and the first loop iteration both fetch page 1
+    assert [call.request.url for call in responses.calls] == [
+        "https://github.com/user/repo/network/dependents?dependent_type=REPOSITORY",
+        "https://github.com/user/repo/network/dependents?dependent_type=REPOSITORY",
+        "https://github.com/user/repo/network/dependents?page=2",
+    ]
+    repos = json.loads(result.stdout)
+    assert [repo["url"] for repo in repos] == [
+        "https://github.com/user1/repo1",
+        "https://github.com/user2/repo2",
+        "https://github.com/user4/repo4",
+        "https://github.com/user3/repo3",
+    ]
+
+
+@pytest.mark.parametrize(("rows", "shown"), [(10, 4), (2, 2)], ids=["all", "top2"])
+@responses.activate
+def test_cli_description_kept_with_its_repo(
+    cli_runner: CliRunner,
+    html_response_dependents: str,
+    html_response_last_page: str,
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    rows: int,
+    shown: int,
+) -> None:
+    """Test descriptions are fetched for the shown rows and land on their repo."""
+    fetched: list[str] = []
+
+    def fake_fetch_description(gh: Any, path: str) -> str:
+        fetched.append(path)
+        return f"about {path}"
+
+    monkeypatch.setattr("ghtopdep.cli.CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr("github3.login", lambda **k: SimpleNamespace(session=None))
+    monkeypatch.setattr("ghtopdep.cli.fetch_description", fake_fetch_description)
+    responses.add(
+        responses.GET,
+        "https://github.com/user/repo/network/dependents?dependent_type=REPOSITORY",
+        body=html_response_dependents,
+    )
+    responses.add(
+        responses.GET,
+        "https://github.com/user/repo/network/dependents?page=2",
+        body=html_response_last_page,
+    )
+
+    result = cli_runner.invoke(
+        cli,
+        [
+            "https://github.com/user/repo",
+            "--json",
+            "--description",
+            "--token",
+            "t",
+            "--rows",
+            str(rows),
+        ],
+    )
+
+    assert result.exit_code == 0
+    repos = json.loads(result.stdout)
+    assert len(repos) == shown
+    assert len(fetched) == shown
+    for repo in repos:
+        path = repo["url"].removeprefix("https://github.com")
+        assert repo["description"] == f"about {path}"
 
 
 class TestCliReportMode:
     """Tests for report mode functionality."""
 
-    @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    def test_cli_report_mode_404_response(
+    @pytest.fixture(autouse=True)
+    def _report_server(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Point report mode at a local server for every test in the class."""
+        monkeypatch.setenv("GHTOPDEP_BASE_URL", "http://localhost:3000")
+
+    @pytest.mark.parametrize(
+        "status,payload,expected",
+        [
+            (404, None, "Doesn't find any repositories"),
+            (
+                200,
+                [{"url": "https://github.com/user/repo1", "stars": 100}],
+                "https://github.com/user/repo1",
+            ),
+        ],
+        ids=["404", "success"],
+    )
+    def test_cli_report_mode_response(
         self,
-        _mock_deps: Any,
-        _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
+        status: int,
+        payload: list[dict[str, Any]] | None,
+        expected: str,
         cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        report_session: Mock,
     ) -> None:
-        """Test report mode when report endpoint returns 404."""
-        mock_get_response = Mock()
-        mock_get_response.status_code = 404
-        mock_get.return_value = mock_get_response
-
-        with patch("ghtopdep.cli.CacheControl"):
-            result = cli_runner.invoke(
-                cli, ["https://github.com/user/repo", "--report"]
-            )
-            # Should handle 404 gracefully
-            assert result.exit_code in [0, 1]
-
-    @patch.dict(os.environ, {"GHTOPDEP_BASE_URL": "http://localhost:3000"})
-    @patch("ghtopdep.cli.requests.get")
-    @patch("ghtopdep.cli.requests.post")
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    def test_cli_report_mode_success(
-        self,
-        _mock_deps: Any,
-        _mock_session: Any,
-        _mock_post: Any,
-        mock_get: Any,
-        cli_runner: CliRunner,
-    ) -> None:
-        """Test report mode with successful response."""
-        mock_get_response = Mock()
-        mock_get_response.status_code = 200
-        mock_get_response.json.return_value = [
-            {"url": "https://github.com/user/repo1", "stars": 100}
-        ]
-        mock_get.return_value = mock_get_response
-
-        with patch("ghtopdep.cli.CacheControl"):
-            result = cli_runner.invoke(
-                cli, ["https://github.com/user/repo", "--report"]
-            )
-            # Should process successful report response
-            assert result.exit_code in [0, 1]
+        """Test report mode with a missing (404) and an existing report."""
+        _stub_scraping(monkeypatch, max_deps=0)
+        report_session.get.return_value = SimpleNamespace(
+            status_code=status, json=lambda: payload
+        )
+        report_session.post.return_value = SimpleNamespace(status_code=201)
+
+        result = cli_runner.invoke(cli, ["https://github.com/user/repo", "--report"])
+        assert result.exit_code == 0
+        assert expected in result.stdout
 
 
 class TestCliMinstFilter:
     """Tests for minimum stars filtering."""
 
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=30)
-    def test_cli_minstar_high_value(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
+    @pytest.mark.parametrize(
+        "minstar", ["0", "100", "1000"], ids=["zero", "mid", "high"]
+    )
+    def test_cli_minstar(
+        self, minstar: str, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        """Test CLI with high minstar value."""
-        with patch("ghtopdep.cli.CacheControl"):
-            result = cli_runner.invoke(
-                cli, ["https://github.com/user/repo", "--minstar", "1000", "--json"]
-            )
-            # Should handle high minstar
-            assert result.exit_code in [0, 1]
-
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=30)
-    def test_cli_minstar_zero_value(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
-    ) -> None:
-        """Test CLI with zero minstar value."""
-        with patch("ghtopdep.cli.CacheControl"):
-            result = cli_runner.invoke(
-                cli, ["https://github.com/user/repo", "--minstar", "0", "--json"]
-            )
-            # Should handle zero minstar
-            assert result.exit_code in [0, 1]
+        """Test CLI accepts a range of minstar values."""
+        _stub_scraping(monkeypatch, max_deps=30)
+        result = cli_runner.invoke(
+            cli, ["https://github.com/user/repo", "--minstar", minstar, "--json"]
+        )
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == []
 
 
 class TestCliSearchMode:
     """Tests for search functionality."""
 
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
     def test_cli_search_option_requires_token(
-        self,
-        _mock_login: Any,
-        _mock_deps: Any,
-        _mock_session: Any,
-        cli_runner: CliRunner,
+        self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test that search requires token."""
-        # Ensure GHTOPDEP_TOKEN is not set in environment
-        with patch.dict(os.environ, {}, clear=True):
-            result = cli_runner.invoke(
-                cli, ["https://github.com/user/repo", "--search", "test_keyword"]
-            )
-            # Should require token
-            assert result.exit_code == 1
+        monkeypatch.delenv("GHTOPDEP_TOKEN", raising=False)
+        _stub_scraping(monkeypatch, max_deps=0)
+        monkeypatch.setattr("github3.login", MagicMock())
+        result = cli_runner.invoke(
+            cli, ["https://github.com/user/repo", "--search", "test_keyword"]
+        )
+        # Should require token
+        assert result.exit_code == 1
 
 
 class TestCliModeSettings:
     """Tests for different mode settings."""
 
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    def test_cli_packages_destination(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
-    ) -> None:
-        """Test packages destination type."""
-        with patch("ghtopdep.cli.CacheControl"):
-            with patch("ghtopdep.cli.HTMLParser"):
-                result = cli_runner.invoke(
-                    cli, ["https://github.com/user/repo", "--packages"]
-                )
-                # Should handle packages mode
-                assert result.exit_code in [0, 1]
-
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    def test_cli_repositories_destination(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
+    @pytest.mark.parametrize(
+        "flag,destinations",
+        [("--packages", "packages"), ("--repositories", "repositories")],
+        ids=["packages", "repositories"],
+    )
+    def test_cli_destination(
+        self,
+        flag: str,
+        destinations: str,
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        """Test repositories destination type (default)."""
-        with patch("ghtopdep.cli.CacheControl"):
-            with patch("ghtopdep.cli.HTMLParser"):
-                result = cli_runner.invoke(
-                    cli, ["https://github.com/user/repo", "--repositories"]
-                )
-                # Should handle repositories mode
-                assert result.exit_code in [0, 1]
-
-
-@patch("ghtopdep.cli.requests.session")
-@patch("ghtopdep.cli.get_max_deps", return_value=30)
+        """Test packages and repositories destination types."""
+        _stub_scraping(monkeypatch, max_deps=0)
+        result = cli_runner.invoke(cli, ["https://github.com/user/repo", flag])
+        assert result.exit_code == 0
+        assert f"Doesn't find any {destinations}" in result.stdout
+
+
+@pytest.mark.parametrize("rows_value", ["1", "5", "10", "100", "1000"])
 def test_cli_rows_option_boundary(
-    _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
+    rows_value: str, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     """Test CLI with various rows values."""
-    test_cases = ["1", "5", "10", "100", "1000"]
+    _stub_scraping(monkeypatch, max_deps=30)
 
-    for rows_value in test_cases:
-        with patch("ghtopdep.cli.CacheControl"):
-            with patch("ghtopdep.cli.HTMLParser"):
-                result = cli_runner.invoke(
-                    cli,
-                    ["https://github.com/user/repo", "--rows", rows_value, "--json"],
-                )
-                # All rows values should be accepted
-                assert result.exit_code in [0, 1]
+    result = cli_runner.invoke(
+        cli, ["https://github.com/user/repo", "--rows", rows_value, "--json"]
+    )
+    # All rows values should be accepted
+    assert result.exit_code == 0
+    assert json.loads(result.stdout) == []
 
 
 class TestEnvironmentConfiguration:
     """Tests for environment variable configuration."""
 
-    @patch.dict(os.environ, {"GHTOPDEP_ENV": "development"})
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
     def test_cli_development_environment(
-        self, _mock_deps: Any, _mock_session: Any, cli_runner: CliRunner
+        self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test CLI in development environment."""
-        with patch("ghtopdep.cli.CacheControl"):
-            with patch("ghtopdep.cli.requests.get"):
-                result = cli_runner.invoke(cli, ["https://github.com/user/repo"])
-                # Should work in dev environment
-                assert result.exit_code in [0, 1]
-
-    @patch.dict(os.environ, {"GHTOPDEP_TOKEN": "test_token_value"})
-    @patch("ghtopdep.cli.requests.session")
-    @patch("ghtopdep.cli.get_max_deps", return_value=0)
-    @patch("ghtopdep.cli.github3.login")
+        monkeypatch.setenv("GHTOPDEP_ENV", "development")
+        _stub_scraping(monkeypatch, max_deps=0)
+        result = cli_runner.invoke(cli, ["https://github.com/user/repo"])
+        # Should work in dev environment
+        assert result.exit_code == 0
+        assert "Doesn't find any repositories" in result.stdout
+
     def test_cli_token_from_environment(
-        self,
-        _mock_login: Any,
-        _mock_deps: Any,
-        _mock_session: Any,
-        cli_runner: CliRunner,
+        self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         """Test CLI uses token from environment variable."""
-        with patch("ghtopdep.cli.CacheControl"):
-            _mock_login.return_value = MagicMock()
-            result = cli_runner.invoke(
-                cli, ["https://github.com/user/repo", "--description"]
-            )
-            # Should use token from environment
-            assert result.exit_code in [0, 1]
+        monkeypatch.setenv("GHTOPDEP_TOKEN", "test_token_value")
+        _stub_scraping(monkeypatch, max_deps=0)
+        monkeypatch.setattr(
+            "github3.login",
+            lambda **k: SimpleNamespace(session=None),
+        )
+        result = cli_runner.invoke(
+            cli, ["https://github.com/user/repo", "--description"]
+        )
+        # Should use token from environment
+        assert result.exit_code == 0
+        assert "Please provide token" not in result.stdout
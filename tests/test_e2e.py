@@ -1,25 +1,17 @@
-"""End-to-end tests for ghtopdep using VCR.py for HTTP recording."""
+"""End-to-end tests for ghtopdep against mocked dependents pages."""
 
-from pathlib import Path
-from typing import Any
-from unittest.mock import MagicMock, patch
+import json
+from collections.abc import Callable
+from contextlib import ExitStack
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
-import vcr
-from click.testing import CliRunner
+from click.testing import CliRunner, Result
 
 from ghtopdep.cli import cli
+from tests.conftest import FakeResponse
 
-# Define cassettes directory using absolute path
-CASSETTES_DIR = Path(__file__).parent / "cassettes"
-
-# Configure VCR to record/replay HTTP interactions
-my_vcr = vcr.VCR(
-    cassette_library_dir=str(CASSETTES_DIR),
-    record_mode="none",  # Set to "new_episodes" to record new cassettes
-    match_on=["method", "scheme", "host", "port", "path", "query"],
-    filter_headers=["authorization", "ghtopdep_token"],
-)
+MockedCli = Callable[[list[str], int, list[str]], tuple[Result, Mock]]
 
 
 @pytest.fixture
@@ -28,503 +20,173 @@ def cli_runner() -> CliRunner:
     return CliRunner()
 
 
-# Create cassettes directory if it doesn't exist
-@pytest.fixture(scope="session", autouse=True)
-def setup_cassettes_dir() -> None:
-    """Ensure cassettes directory exists."""
-    CASSETTES_DIR.mkdir(exist_ok=True)
+@pytest.fixture
+def mocked_cli(cli_runner: CliRunner, mock_requests_session: Mock) -> MockedCli:
+    """
+    Invoke the CLI against canned dependents pages.
+
+    The returned callable takes the HTML pages to serve in order, the value
+    get_max_deps should report and the CLI arguments, and returns the Click
+    result together with the mocked scraping session.
+    """
+
+    def invoke(
+        pages: list[str], max_deps: int, cli_args: list[str]
+    ) -> tuple[Result, Mock]:
+        with ExitStack() as stack:
+            stack.enter_context(
+                patch(
+                    "ghtopdep.cli.requests.session", return_value=mock_requests_session
+                )
+            )
+            stack.enter_context(
+                patch("ghtopdep.cli.get_max_deps", return_value=max_deps)
+            )
+            stack.enter_context(patch("ghtopdep.cli.CacheControl"))
+
+            mock_requests_session.get.side_effect = [
+                FakeResponse(page) for page in pages
+            ]
+            return cli_runner.invoke(cli, cli_args), mock_requests_session
+
+    return invoke
 
 
 class TestE2EWithMocks:
     """E2E tests using mocked HTTP responses to simulate real workflows."""
 
-    def test_e2e_complete_workflow_mock(self, cli_runner: CliRunner) -> None:
+    def test_e2e_complete_workflow_mock(
+        self, mocked_cli: MockedCli, fixture_html: dict[str, str]
+    ) -> None:
         """Test complete workflow: validate URL, fetch dependents, parse, sort, display."""
-        html_page_1 = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">90 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo1">user1/repo1</a></span>
-                            <div><span>500</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user2/repo2">user2/repo2</a></span>
-                            <div><span>1,200</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user3/repo3">user3/repo3</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=2">Next</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        html_page_2 = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">90 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user4/repo4">user4/repo4</a></span>
-                            <div><span>2,000</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=90):
-                mock_session = MagicMock()
-
-                # Create responses for two pages
-                response1 = Mock()
-                response1.text = html_page_1
-                response1.status_code = 200
-
-                response2 = Mock()
-                response2.text = html_page_2
-                response2.status_code = 200
-
-                mock_session.get.side_effect = [response1, response2]
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    result = cli_runner.invoke(
-                        cli,
-                        ["https://github.com/test/repo", "--json", "--minstar", "100"],
-                    )
-
-                    # Should complete successfully
-                    assert result.exit_code in [0, 1]
-                    # Should have made requests
-                    assert mock_session.get.called
+        result, mock_session = mocked_cli(
+            [fixture_html["complete_page_1"], fixture_html["complete_page_2"]],
+            90,
+            ["https://github.com/test/repo", "--json", "--minstar", "100"],
+        )
 
-    def test_e2e_with_description_mock(self, cli_runner: CliRunner) -> None:
+        assert result.exit_code == 0
+        # Both pages were fetched and their repos merged, most stars first
+        assert mock_session.get.call_count == 2
+        assert json.loads(result.stdout) == [
+            {"url": "https://github.com/user4/repo4", "stars": 2000},
+            {"url": "https://github.com/user2/repo2", "stars": 1200},
+            {"url": "https://github.com/user1/repo1", "stars": 500},
+            {"url": "https://github.com/user3/repo3", "stars": 100},
+        ]
+
+    def test_e2e_with_description_mock(
+        self, mocked_cli: MockedCli, fixture_html: dict[str, str]
+    ) -> None:
         """Test workflow with description fetching."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">30 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo1">user1/repo1</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=30):
-                with patch("ghtopdep.cli.github3.login") as mock_login:
-                    mock_session = MagicMock()
-                    response = Mock()
-                    response.text = html_response
-                    response.status_code = 200
-                    mock_session.get.return_value = response
-                    mock_session_class.return_value = mock_session
-
-                    # Mock GitHub client
-                    mock_gh = MagicMock()
-                    mock_repo = MagicMock()
-                    mock_repo.description = "Test repository description"
-                    mock_gh.repository.return_value = mock_repo
-                    mock_login.return_value = mock_gh
-
-                    with patch("ghtopdep.cli.CacheControl"):
-                        result = cli_runner.invoke(
-                            cli,
-                            [
-                                "https://github.com/test/repo",
-                                "--description",
-                                "--token",
-                                "test_token",
-                                "--json",
-                            ],
-                        )
-
-                        # Should complete successfully
-                        assert result.exit_code in [0, 1]
-
-    def test_e2e_table_output_format_mock(self, cli_runner: CliRunner) -> None:
-        """Test workflow with table output format."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">30 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo1">user1/repo1</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user2/repo2">user2/repo2</a></span>
-                            <div><span>50</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=30):
-                mock_session = MagicMock()
-                response = Mock()
-                response.text = html_response
-                response.status_code = 200
-                mock_session.get.return_value = response
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    result = cli_runner.invoke(
-                        cli,
-                        [
-                            "https://github.com/test/repo",
-                            "--table",
-                            "--rows",
-                            "10",
-                        ],
-                    )
-
-                    # Should complete successfully
-                    assert result.exit_code in [0, 1]
-
-    def test_e2e_packages_mode_mock(self, cli_runner: CliRunner) -> None:
-        """Test workflow with packages mode."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">20 packages</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/org/package">org/package</a></span>
-                            <div><span>250</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=20):
-                mock_session = MagicMock()
-                response = Mock()
-                response.text = html_response
-                response.status_code = 200
-                mock_session.get.return_value = response
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    result = cli_runner.invoke(
-                        cli,
-                        [
-                            "https://github.com/test/package",
-                            "--packages",
-                            "--json",
-                        ],
-                    )
-
-                    # Should complete successfully
-                    assert result.exit_code in [0, 1]
-
-    def test_e2e_high_star_filtering_mock(self, cli_runner: CliRunner) -> None:
-        """Test filtering repos by high star count."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">100 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/popular">user1/popular</a></span>
-                            <div><span>5,000</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user2/less">user2/less</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user3/tiny">user3/tiny</a></span>
-                            <div><span>10</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=100):
-                mock_session = MagicMock()
-                response = Mock()
-                response.text = html_response
-                response.status_code = 200
-                mock_session.get.return_value = response
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    result = cli_runner.invoke(
-                        cli,
-                        [
-                            "https://github.com/test/repo",
-                            "--minstar",
-                            "500",
-                            "--json",
-                        ],
-                    )
-
-                    # Should complete successfully
-                    assert result.exit_code in [0, 1]
-
-    def test_e2e_rows_limit_mock(self, cli_runner: CliRunner) -> None:
-        """Test limiting output rows."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">50 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo1">user1/repo1</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user2/repo2">user2/repo2</a></span>
-                            <div><span>200</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user3/repo3">user3/repo3</a></span>
-                            <div><span>300</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=50):
-                mock_session = MagicMock()
-                response = Mock()
-                response.text = html_response
-                response.status_code = 200
-                mock_session.get.return_value = response
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    result = cli_runner.invoke(
-                        cli,
-                        [
-                            "https://github.com/test/repo",
-                            "--rows",
-                            "2",
-                            "--json",
-                        ],
-                    )
+        with patch("github3.login") as mock_login:
+            # Mock GitHub client
+            mock_gh = MagicMock()
+            mock_repo = MagicMock()
+            mock_repo.description = "Test repository description"
+            mock_gh.repository.return_value = mock_repo
+            mock_login.return_value = mock_gh
+
+            result, _ = mocked_cli(
+                [fixture_html["description"]],
+                30,
+                [
+                    "https://github.com/test/repo",
+                    "--description",
+                    "--token",
+                    "test_token",
+                    "--json",
+                ],
+            )
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == [
+            {
+                "url": "https://github.com/user1/repo1",
+                "stars": 100,
+                "description": "Test repository description",
+            }
+        ]
+
+    def test_e2e_table_output(
+        self, mocked_cli: MockedCli, fixture_html: dict[str, str]
+    ) -> None:
+        """Test the table view lists each repo with its stars and a summary."""
+        result, _ = mocked_cli(
+            [fixture_html["table"]],
+            30,
+            ["https://github.com/test/repo", "--table", "--rows", "10"],
+        )
 
-                    # Should complete successfully
-                    assert result.exit_code in [0, 1]
+        assert result.exit_code == 0
+        assert "| https://github.com/user1/repo1 |     100 |" in result.stdout
+        assert "| https://github.com/user2/repo2 |      50 |" in result.stdout
+        assert "found 2 repositories with more than zero star" in result.stdout
+
+    @pytest.mark.parametrize(
+        ("scenario", "max_deps", "cli_args", "expected"),
+        [
+            (
+                "packages",
+                20,
+                ["https://github.com/test/package", "--packages", "--json"],
+                [("org/package", 250)],
+            ),
+            (
+                "high_star",
+                100,
+                ["https://github.com/test/repo", "--minstar", "500", "--json"],
+                [("user1/popular", 5000)],
+            ),
+            (
+                "rows",
+                50,
+                ["https://github.com/test/repo", "--rows", "2", "--json"],
+                [("user3/repo3", 300), ("user2/repo2", 200)],
+            ),
+            (
+                "no_stars",
+                10,
+                ["https://github.com/test/repo", "--minstar", "5", "--json"],
+                [("user2/repo2", 100)],
+            ),
+            (
+                "duplicate",
+                30,
+                ["https://github.com/test/repo", "--json"],
+                [("user1/repo", 100)],
+            ),
+        ],
+        ids=["packages", "high_star", "rows", "no_stars", "dup"],
+    )
+    def test_e2e_scenarios(
+        self,
+        mocked_cli: MockedCli,
+        fixture_html: dict[str, str],
+        scenario: str,
+        max_deps: int,
+        cli_args: list[str],
+        expected: list[tuple[str, int]],
+    ) -> None:
+        """Test modes, star filtering, row limits and duplicates in JSON output."""
+        result, _ = mocked_cli([fixture_html[scenario]], max_deps, cli_args)
+
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == [
+            {"url": f"https://github.com/{path}", "stars": stars}
+            for path, stars in expected
+        ]
 
 
 class TestE2EErrorRecovery:
     """E2E tests for error handling and recovery."""
 
-    @staticmethod
-    def _invoke_with_mocked_session(
-        cli_runner: CliRunner,
-        html_response: str,
-        max_deps: int = 0,
-        cli_args: list[str] | None = None,
-    ) -> Any:
-        """
-        Helper method to invoke CLI with mocked session.
-
-        Args:
-            cli_runner: Click test runner
-            html_response: HTML content to return from mocked session
-            max_deps: Value to return from get_max_deps mock
-            cli_args: List of CLI arguments (default: ["https://github.com/test/repo", "--json"])
-
-        Returns:
-            Click test result
-        """
-        from unittest.mock import Mock
-
-        if cli_args is None:
-            cli_args = ["https://github.com/test/repo", "--json"]
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=max_deps):
-                mock_session = MagicMock()
-                response = Mock()
-                response.text = html_response
-                response.status_code = 200
-                mock_session.get.return_value = response
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    return cli_runner.invoke(cli, cli_args)
-
-    def test_e2e_handle_empty_results_mock(self, cli_runner: CliRunner) -> None:
+    def test_e2e_handle_empty_results_mock(
+        self, mocked_cli: MockedCli, fixture_html: dict[str, str]
+    ) -> None:
         """Test handling when no dependents are found."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">0 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box"></div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        result = self._invoke_with_mocked_session(cli_runner, html_response, max_deps=0)
-        # Should handle empty results gracefully
-        assert result.exit_code in [0, 1]
-
-    def test_e2e_handle_no_stars_repos_mock(self, cli_runner: CliRunner) -> None:
-        """Test handling repos with zero stars."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">10 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo1">user1/repo1</a></span>
-                            <div><span>0</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user2/repo2">user2/repo2</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        from unittest.mock import Mock
-
-        with patch("ghtopdep.cli.requests.session") as mock_session_class:
-            with patch("ghtopdep.cli.get_max_deps", return_value=10):
-                mock_session = MagicMock()
-                response = Mock()
-                response.text = html_response
-                response.status_code = 200
-                mock_session.get.return_value = response
-                mock_session_class.return_value = mock_session
-
-                with patch("ghtopdep.cli.CacheControl"):
-                    result = cli_runner.invoke(
-                        cli,
-                        ["https://github.com/test/repo", "--minstar", "5", "--json"],
-                    )
-
-                    # Should handle zero-star repos appropriately
-                    assert result.exit_code in [0, 1]
-
-    def test_e2e_duplicate_repo_handling_mock(self, cli_runner: CliRunner) -> None:
-        """Test handling of duplicate repository entries."""
-        html_response = """
-        <html>
-            <body>
-                <div class="table-list-header-toggle">
-                    <button class="btn-link selected">30 repositories</button>
-                </div>
-                <div id="dependents">
-                    <div class="Box">
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo">user1/repo</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                        <div class="flex-items-center">
-                            <span><a class="text-bold" href="/user1/repo">user1/repo</a></span>
-                            <div><span>100</span></div>
-                        </div>
-                    </div>
-                    <div class="paginate-container">
-                        <a href="/network/dependents?page=1">Previous</a>
-                    </div>
-                </div>
-            </body>
-        </html>
-        """
-
-        result = self._invoke_with_mocked_session(
-            cli_runner, html_response, max_deps=30
+        result, _ = mocked_cli(
+            [fixture_html["empty"]], 0, ["https://github.com/test/repo", "--json"]
         )
-        # Should handle duplicates by filtering them out
-        assert result.exit_code in [0, 1]
+        assert result.exit_code == 0
+        assert json.loads(result.stdout) == []
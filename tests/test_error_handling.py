@@ -1,60 +1,128 @@
 """Unit tests for error handling in ghtopdep API calls."""
 
+import json
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
 from typing import Any
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, create_autospec
 
+import github3
 import pytest
-import requests
-from click.testing import CliRunner
+import responses
+from click.testing import CliRunner, Result
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import Timeout
 
 from ghtopdep.cli import (
     OneDayHeuristic,
+    ScrapeError,
     cli,
     fetch_description,
     get_max_deps,
 )
+from tests.conftest import FakeResponse
+
+DEPS_URL = "http://github.com/test/repo/network/dependents"
+BASE_URL = "http://localhost:3000"
+REPORT_URL = f"{BASE_URL}/repos/test/repo"
+SERVER_DATE = "Wed, 21 Oct 2024 07:28:00 GMT"
+# What update_headers derives from SERVER_DATE: one day later, via formatdate
+EXPECTED_VALID_HEADERS = {
+    "expires": "Tue, 22 Oct 2024 07:28:00 -0000",
+    "cache-control": "public",
+}
+
+
+@pytest.fixture
+def heuristic() -> OneDayHeuristic:
+    """Give each update_headers test a heuristic with no memoised expiry."""
+    return OneDayHeuristic()
+
+
+@pytest.fixture(scope="module")
+def _gh_spec() -> Any:
+    """Autospec of github3.GitHub; introspecting the class once per module."""
+    gh = create_autospec(github3.GitHub, instance=True)
+    # Assigned in GitHub.__init__, so the class-level spec lacks it
+    gh.session = Mock()
+    return gh
+
+
+@pytest.fixture
+def gh_mock(_gh_spec: Any) -> Any:
+    """GitHub client mock restricted to the github3.GitHub API, reset per test."""
+    _gh_spec.reset_mock(return_value=True, side_effect=True)
+    return _gh_spec
+
+
+@pytest.fixture
+def sess_ok() -> Mock:
+    """Session whose GET returns an empty 200 page."""
+    sess = Mock()
+    sess.get.return_value = FakeResponse("<html></html>")
+    return sess
+
+
+@pytest.fixture
+def html_parser_mock(monkeypatch: pytest.MonkeyPatch) -> Callable[[str], Mock]:
+    """
+    Patch ghtopdep.cli.HTMLParser so the counter element carries the given text.
+
+    Returns a builder taking the element text and returning the element mock.
+    """
+
+    def _make(text: str) -> Mock:
+        mock_element = Mock()
+        mock_element.text.return_value = text
+        parser = Mock()
+        parser.css_first.return_value = mock_element
+        monkeypatch.setattr("ghtopdep.cli.HTMLParser", Mock(return_value=parser))
+        return mock_element
+
+    return _make
+
+
+@pytest.fixture(scope="module")
+def cli_runner() -> CliRunner:
+    """Create a Click CLI runner shared by the tests in this module."""
+    return CliRunner()
 
 
 class TestOneDayHeuristicErrorHandling:
     """Tests for OneDayHeuristic.update_headers() error handling."""
 
-    def test_update_headers_missing_date(self) -> None:
+    def test_update_headers_missing_date(self, heuristic: OneDayHeuristic) -> None:
         """Test handling of missing 'date' header."""
-        heuristic = OneDayHeuristic()
-        response = Mock()
-        response.status = 200
-        response.headers = {}  # No date header
+        response = SimpleNamespace(status=200, headers={})  # No date header
 
         result = heuristic.update_headers(response)
         assert result == {}
 
-    def test_update_headers_invalid_date_format(self) -> None:
+    def test_update_headers_invalid_date_format(
+        self, heuristic: OneDayHeuristic
+    ) -> None:
         """Test handling of invalid date format."""
-        heuristic = OneDayHeuristic()
-        response = Mock()
-        response.status = 200
-        response.headers = {"date": "invalid-date-format"}
+        response = SimpleNamespace(status=200, headers={"date": "invalid-date-format"})
 
         result = heuristic.update_headers(response)
         assert result == {}
 
-    def test_update_headers_valid_date(self) -> None:
+    def test_update_headers_valid_date(self, heuristic: OneDayHeuristic) -> None:
         """Test successful date parsing."""
-        heuristic = OneDayHeuristic()
-        response = Mock()
-        response.status = 200
-        response.headers = {"date": "Wed, 21 Oct 2024 07:28:00 GMT"}
+        response = SimpleNamespace(status=200, headers={"date": SERVER_DATE})
 
         result = heuristic.update_headers(response)
-        assert "expires" in result
-        assert result["cache-control"] == "public"
+        assert result == EXPECTED_VALID_HEADERS
 
-    def test_update_headers_non_cacheable_status(self) -> None:
+    def test_update_headers_non_cacheable_status(
+        self, heuristic: OneDayHeuristic
+    ) -> None:
         """Test non-cacheable status codes."""
-        heuristic = OneDayHeuristic()
-        response = Mock()
-        response.status = 500  # Not in cacheable_by_default_statuses
-        response.headers = {"date": "Wed, 21 Oct 2024 07:28:00 GMT"}
+        response = SimpleNamespace(
+            status=500,  # Not in cacheable_by_default_statuses
+            headers={"date": SERVER_DATE},
+        )
 
         result = heuristic.update_headers(response)
         assert result == {}
@@ -63,365 +131,329 @@ class TestOneDayHeuristicErrorHandling:
 class TestFetchDescriptionErrorHandling:
     """Tests for fetch_description() error handling."""
 
-    def test_fetch_description_invalid_url_format(self, capsys: Any) -> None:
+    def test_fetch_description_invalid_url_format(
+        self, gh_mock: Mock, capsys: Any
+    ) -> None:
         """Test handling of invalid URL format."""
-        gh = Mock()
-        result = fetch_description(gh, "invalid")
+        result = fetch_description(gh_mock, "invalid")
         assert result == ""
         captured = capsys.readouterr()
-        assert "Warning: Invalid relative URL format" in captured.err
+        assert captured.err.startswith("Warning: Invalid relative URL format")
 
-    def test_fetch_description_missing_repository(self, capsys: Any) -> None:
+    def test_fetch_description_missing_repository(
+        self, gh_mock: Mock, capsys: Any
+    ) -> None:
         """Test handling when repository is missing from URL."""
-        gh = Mock()
-        result = fetch_description(gh, "/owner/")
+        result = fetch_description(gh_mock, "/owner/")
         assert result == ""
         captured = capsys.readouterr()
-        assert "Warning: Empty owner or repository" in captured.err
+        assert captured.err.startswith("Warning: Empty owner or repository")
 
-    def test_fetch_description_api_exception(self, capsys: Any) -> None:
+    def test_fetch_description_api_exception(self, gh_mock: Mock, capsys: Any) -> None:
         """Test handling of GitHub API exceptions."""
-        gh = Mock()
-        gh.repository.side_effect = Exception("API Error")
+        gh_mock.repository.side_effect = Exception("API Error")
 
-        result = fetch_description(gh, "/owner/repo")
+        result = fetch_description(gh_mock, "/owner/repo")
         assert result == ""
         captured = capsys.readouterr()
-        assert "Warning: Failed to fetch repository" in captured.err
+        assert captured.err.startswith("Warning: Failed to fetch repository")
 
-    def test_fetch_description_repository_not_found(self, capsys: Any) -> None:
+    def test_fetch_description_repository_not_found(
+        self, gh_mock: Mock, capsys: Any
+    ) -> None:
         """Test handling when repository is not found."""
-        gh = Mock()
-        gh.repository.return_value = None
+        gh_mock.repository.return_value = None
 
-        result = fetch_description(gh, "/owner/repo")
+        result = fetch_description(gh_mock, "/owner/repo")
         assert result == ""
         captured = capsys.readouterr()
-        assert "Warning: Repository not found" in captured.err
+        assert captured.err.startswith("Warning: Repository not found")
 
-    def test_fetch_description_success(self) -> None:
+    def test_fetch_description_success(self, gh_mock: Mock) -> None:
         """Test successful description fetch."""
-        gh = Mock()
-        repo = Mock()
-        repo.description = "A test repository"
-        gh.repository.return_value = repo
+        gh_mock.repository.return_value = SimpleNamespace(
+            description="A test repository"
+        )
 
-        result = fetch_description(gh, "/owner/repo")
+        result = fetch_description(gh_mock, "/owner/repo")
         assert "test repository" in result
 
-    def test_fetch_description_no_description(self) -> None:
+    def test_fetch_description_no_description(self, gh_mock: Mock) -> None:
         """Test repository with no description."""
-        gh = Mock()
-        repo = Mock()
-        repo.description = None
-        gh.repository.return_value = repo
+        gh_mock.repository.return_value = SimpleNamespace(description=None)
 
-        result = fetch_description(gh, "/owner/repo")
+        result = fetch_description(gh_mock, "/owner/repo")
         assert result == " "
 
 
 class TestGetMaxDepsErrorHandling:
     """Tests for get_max_deps() error handling."""
 
-    def test_get_max_deps_timeout(self, capsys: Any) -> None:
-        """Test handling of request timeout."""
-        sess = Mock()
-        sess.get.side_effect = requests.exceptions.Timeout()
-
-        with pytest.raises(SystemExit) as exc_info:
-            get_max_deps(sess, "http://github.com/test/repo/network/dependents")
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "Error: Request timeout" in captured.err
-
-    def test_get_max_deps_connection_error(self, capsys: Any) -> None:
-        """Test handling of connection errors."""
+    @pytest.mark.parametrize(
+        ("side_effect", "expected_err"),
+        [
+            (Timeout(), "Request timeout"),
+            (RequestsConnectionError("Connection failed"), "Connection failed"),
+            ([FakeResponse("", status_code=404)], "HTTP error"),
+        ],
+        ids=["timeout", "connection_error", "http_error"],
+    )
+    def test_get_max_deps_request_errors(
+        self, side_effect: Any, expected_err: str
+    ) -> None:
+        """Test that request failures raise ScrapeError naming the cause."""
         sess = Mock()
-        sess.get.side_effect = requests.exceptions.ConnectionError("Connection failed")
+        sess.get.side_effect = side_effect
 
-        with pytest.raises(SystemExit) as exc_info:
-            get_max_deps(sess, "http://github.com/test/repo/network/dependents")
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "Error: Connection failed" in captured.err
+        with pytest.raises(ScrapeError) as exc_info:
+            get_max_deps(sess, DEPS_URL)
+        assert exc_info.value.exit_code == 1
+        assert exc_info.value.message.startswith(expected_err)
 
-    def test_get_max_deps_http_error(self, capsys: Any) -> None:
-        """Test handling of HTTP errors."""
-        sess = Mock()
-        response = Mock()
-        response.raise_for_status.side_effect = requests.exceptions.HTTPError(
-            "404 Not Found"
+    def test_get_max_deps_missing_html_element(self, sess_ok: Mock) -> None:
+        """Test handling of missing HTML element."""
+        with pytest.raises(ScrapeError) as exc_info:
+            get_max_deps(sess_ok, DEPS_URL)
+        assert exc_info.value.message.startswith(
+            "Could not find dependents count element"
         )
-        sess.get.return_value = response
 
-        with pytest.raises(SystemExit) as exc_info:
-            get_max_deps(sess, "http://github.com/test/repo/network/dependents")
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "Error: HTTP error" in captured.err
+    def test_get_max_deps_element_no_text(
+        self, sess_ok: Mock, html_parser_mock: Callable[[str], Mock]
+    ) -> None:
+        """Test handling of element with no text content."""
+        html_parser_mock("")
 
-    def test_get_max_deps_missing_html_element(self, capsys: Any) -> None:
-        """Test handling of missing HTML element."""
-        sess = Mock()
-        response = Mock()
-        response.status_code = 200
-        response.text = "<html></html>"  # No dependents element
-        sess.get.return_value = response
-
-        with pytest.raises(SystemExit) as exc_info:
-            get_max_deps(sess, "http://github.com/test/repo/network/dependents")
-        assert exc_info.value.code == 1
-        captured = capsys.readouterr()
-        assert "Error: Could not find dependents count element" in captured.err
+        with pytest.raises(ScrapeError) as exc_info:
+            get_max_deps(sess_ok, DEPS_URL)
+        assert exc_info.value.message == "Dependents count element has no text content"
 
-    def test_get_max_deps_element_no_text(self, capsys: Any) -> None:
-        """Test handling of element with no text content."""
-        sess = Mock()
-        response = Mock()
-        response.status_code = 200
-        response.raise_for_status.return_value = None
-        response.text = "<html></html>"
-        sess.get.return_value = response
-
-        with patch("ghtopdep.cli.HTMLParser") as mock_parser:
-            mock_element = Mock()
-            mock_element.text.return_value = ""
-            mock_parser_instance = Mock()
-            mock_parser_instance.css_first.return_value = mock_element
-            mock_parser.return_value = mock_parser_instance
-
-            with pytest.raises(SystemExit) as exc_info:
-                get_max_deps(sess, "http://github.com/test/repo/network/dependents")
-            assert exc_info.value.code == 1
-            captured = capsys.readouterr()
-            assert "Error: Dependents count element has no text content" in captured.err
-
-    def test_get_max_deps_invalid_number_format(self, capsys: Any) -> None:
+    def test_get_max_deps_invalid_number_format(
+        self, sess_ok: Mock, html_parser_mock: Callable[[str], Mock]
+    ) -> None:
         """Test handling of invalid number format in element text."""
-        sess = Mock()
-        response = Mock()
-        response.status_code = 200
-        response.raise_for_status.return_value = None
-        response.text = "<html></html>"
-        sess.get.return_value = response
-
-        with patch("ghtopdep.cli.HTMLParser") as mock_parser:
-            mock_element = Mock()
-            mock_element.text.return_value = "invalid-number Repositories"
-            mock_parser_instance = Mock()
-            mock_parser_instance.css_first.return_value = mock_element
-            mock_parser.return_value = mock_parser_instance
-
-            with pytest.raises(SystemExit) as exc_info:
-                get_max_deps(sess, "http://github.com/test/repo/network/dependents")
-            assert exc_info.value.code == 1
-            captured = capsys.readouterr()
-            assert "Error: Could not parse dependents count" in captured.err
-
-    def test_get_max_deps_success(self) -> None:
+        html_parser_mock("invalid-number Repositories")
+
+        with pytest.raises(ScrapeError) as exc_info:
+            get_max_deps(sess_ok, DEPS_URL)
+        assert exc_info.value.message.startswith("Could not parse dependents count")
+
+    def test_get_max_deps_success(
+        self, sess_ok: Mock, html_parser_mock: Callable[[str], Mock]
+    ) -> None:
         """Test successful max deps retrieval."""
-        sess = Mock()
-        response = Mock()
-        response.status_code = 200
-        response.raise_for_status.return_value = None
-        response.text = "<html></html>"
-        sess.get.return_value = response
+        html_parser_mock("1,234 Repositories")
 
-        with patch("ghtopdep.cli.HTMLParser") as mock_parser:
-            mock_element = Mock()
-            mock_element.text.return_value = "1,234 Repositories"
-            mock_parser_instance = Mock()
-            mock_parser_instance.css_first.return_value = mock_element
-            mock_parser.return_value = mock_parser_instance
+        result = get_max_deps(sess_ok, DEPS_URL)
+        assert result == 1234
 
-            result = get_max_deps(
-                sess, "http://github.com/test/repo/network/dependents"
-            )
-            assert result == 1234
+
+def _stub_scraping_session(monkeypatch: pytest.MonkeyPatch, session: Any) -> None:
+    """Route the CLI's scraping session to ``session``."""
+    monkeypatch.setattr("ghtopdep.cli.requests.session", lambda: session)
 
 
 class TestReportModeErrorHandling:
     """Tests for report mode error handling."""
 
-    def test_report_mode_get_timeout(self) -> None:
-        """Test handling of report server GET timeout."""
-        runner = CliRunner()
-        with patch("ghtopdep.cli.requests.get") as mock_get:
-            mock_get.side_effect = requests.exceptions.Timeout()
-
-            with runner.isolated_filesystem():
-                result = runner.invoke(
-                    cli,
-                    ["https://github.com/test/repo", "--report"],
-                    env={"GHTOPDEP_BASE_URL": "http://localhost:3000"},
-                )
-
-                assert result.exit_code == 1
-
-    def test_report_mode_get_connection_error(self) -> None:
-        """Test handling of report server GET connection error."""
-        runner = CliRunner()
-        with patch("ghtopdep.cli.requests.get") as mock_get:
-            mock_get.side_effect = requests.exceptions.ConnectionError(
-                "Connection failed"
-            )
-
-            result = runner.invoke(
-                cli,
-                ["https://github.com/test/repo", "--report"],
-                env={"GHTOPDEP_BASE_URL": "http://localhost:3000"},
-            )
-
-            assert result.exit_code == 1
-
-    def test_report_mode_post_timeout(self) -> None:
-        """Test handling of report server POST timeout."""
-        runner = CliRunner()
-
-        with (
-            patch("ghtopdep.cli.requests.get") as mock_get,
-            patch("ghtopdep.cli.get_max_deps") as mock_max_deps,
-            patch("ghtopdep.cli.requests.post") as mock_post,
-        ):
-            # GET returns 404 (no cached data), so scraping proceeds
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_get.return_value = mock_response
-
-            mock_max_deps.return_value = 0
-
-            mock_post.side_effect = requests.exceptions.Timeout()
-
-            result = runner.invoke(
-                cli,
-                ["https://github.com/test/repo", "--report"],
-                env={"GHTOPDEP_BASE_URL": "http://localhost:3000"},
-            )
-
-            # Should exit with error code
-            assert result.exit_code == 1
-
-    def test_report_mode_post_connection_error(self) -> None:
-        """Test handling of report server POST connection error."""
-        runner = CliRunner()
-
-        with (
-            patch("ghtopdep.cli.requests.get") as mock_get,
-            patch("ghtopdep.cli.get_max_deps") as mock_max_deps,
-            patch("ghtopdep.cli.requests.post") as mock_post,
-        ):
-            # GET returns 404 (no cached data), so scraping proceeds
-            mock_response = Mock()
-            mock_response.status_code = 404
-            mock_get.return_value = mock_response
-
-            mock_max_deps.return_value = 0
-
-            mock_post.side_effect = requests.exceptions.ConnectionError(
-                "Connection failed"
-            )
-
-            result = runner.invoke(
-                cli,
-                ["https://github.com/test/repo", "--report"],
-                env={"GHTOPDEP_BASE_URL": "http://localhost:3000"},
-            )
-
-            assert result.exit_code == 1
+    @pytest.mark.parametrize(
+        ("exc", "expected_err"),
+        [
+            (Timeout(), "Error: Report server request timeout"),
+            (
+                RequestsConnectionError("Connection failed"),
+                "Error: Could not connect to report server",
+            ),
+        ],
+        ids=["timeout", "connection_error"],
+    )
+    @responses.activate(assert_all_requests_are_fired=True)
+    def test_report_mode_get_errors(
+        self,
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        exc: Exception,
+        expected_err: str,
+    ) -> None:
+        """Test handling of report server GET failures."""
+        responses.add(responses.GET, REPORT_URL, body=exc)
+        monkeypatch.setattr("ghtopdep.cli.CACHE_DIR", str(tmp_path))
+
+        result = cli_runner.invoke(
+            cli,
+            ["https://github.com/test/repo", "--report"],
+            env={"GHTOPDEP_BASE_URL": BASE_URL},
+            catch_exceptions=False,
+        )
+
+        assert result.exit_code == 1
+        assert expected_err in result.output
+
+    @pytest.mark.parametrize(
+        ("exc", "expected_err"),
+        [
+            (
+                Timeout(),
+                "Error: Report server POST request timeout",
+            ),
+            (
+                RequestsConnectionError("Connection failed"),
+                "Error: Could not connect to report server to submit results",
+            ),
+        ],
+        ids=["timeout", "connection_error"],
+    )
+    @responses.activate(assert_all_requests_are_fired=True)
+    def test_report_mode_post_errors(
+        self,
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        exc: Exception,
+        expected_err: str,
+    ) -> None:
+        """Test handling of report server POST failures."""
+        # GET returns 404 (no cached data), so scraping proceeds
+        responses.add(responses.GET, REPORT_URL, status=404)
+        responses.add(responses.POST, f"{BASE_URL}/repos", body=exc)
+        monkeypatch.setattr("ghtopdep.cli.CACHE_DIR", str(tmp_path))
+        monkeypatch.setattr("ghtopdep.cli.get_max_deps", Mock(return_value=0))
+        _stub_scraping_session(
+            monkeypatch, Mock(get=Mock(return_value=FakeResponse("<html></html>")))
+        )
+
+        result = cli_runner.invoke(
+            cli,
+            ["https://github.com/test/repo", "--report"],
+            env={"GHTOPDEP_BASE_URL": BASE_URL},
+            catch_exceptions=False,
+        )
+
+        # Should exit with error code
+        assert result.exit_code == 1
+        assert expected_err in result.output
 
 
 class TestMainScrapingLoopErrorHandling:
     """Tests for main scraping loop error handling."""
 
-    def test_scraping_loop_network_timeout(self) -> None:
-        """Test handling of network timeout during scraping."""
-        runner = CliRunner()
-
-        with (
-            patch("ghtopdep.cli.requests.session") as mock_session_class,
-            patch("ghtopdep.cli.get_max_deps") as mock_max_deps,
-        ):
-            mock_session = Mock()
-            mock_session_class.return_value = mock_session
-            mock_max_deps.return_value = 30
-
-            # First call succeeds (get_max_deps), second call times out
-            mock_session.get.side_effect = [
-                Mock(
-                    status_code=200, text="<html></html>", raise_for_status=lambda: None
-                ),
-                requests.exceptions.Timeout(),
-            ]
-
-            result = runner.invoke(cli, ["https://github.com/test/repo"])
-
-            # Should handle gracefully and exit successfully (with warning)
-            assert result.exit_code == 0 or "Warning" in result.output
-
-    def test_scraping_loop_connection_error(self) -> None:
-        """Test handling of connection error during scraping."""
-        runner = CliRunner()
-
-        with (
-            patch("ghtopdep.cli.requests.session") as mock_session_class,
-            patch("ghtopdep.cli.get_max_deps") as mock_max_deps,
-        ):
-            mock_session = Mock()
-            mock_session_class.return_value = mock_session
-            mock_max_deps.return_value = 30
-
-            mock_session.get.side_effect = requests.exceptions.ConnectionError(
-                "Network unreachable"
-            )
-
-            result = runner.invoke(cli, ["https://github.com/test/repo"])
-
-            # Should handle gracefully
-            assert result.exit_code == 0 or "Warning" in result.output
-
-    def test_scraping_loop_html_parse_error(self) -> None:
-        """Test handling of HTML parsing error."""
-        runner = CliRunner()
-
-        with (
-            patch("ghtopdep.cli.requests.session") as mock_session_class,
-            patch("ghtopdep.cli.get_max_deps") as mock_max_deps,
-            patch("ghtopdep.cli.HTMLParser") as mock_parser_class,
-        ):
-            mock_session = Mock()
-            mock_session_class.return_value = mock_session
-            mock_max_deps.return_value = 30
+    @pytest.mark.parametrize(
+        ("exc", "pages_before", "warning", "expected"),
+        [
+            (
+                Timeout(),
+                1,
+                "Warning: Request timeout on page 2, stopping pagination",
+                [
+                    {"url": "https://github.com/user1/repo1", "stars": 1500},
+                    {"url": "https://github.com/user2/repo2", "stars": 500},
+                    {"url": "https://github.com/user3/repo3", "stars": 50},
+                ],
+            ),
+            (
+                RequestsConnectionError("Network unreachable"),
+                0,
+                "Warning: Connection error on page 1: Network unreachable",
+                [],
+            ),
+        ],
+        ids=["timeout", "connection_error"],
+    )
+    def test_scraping_loop_network_errors(
+        self,
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        html_response_dependents: str,
+        exc: Exception,
+        pages_before: int,
+        warning: str,
+        expected: list[dict[str, Any]],
+    ) -> None:
+        """Test a network failure stops pagination and keeps the pages read."""
+        pages = [FakeResponse(html_response_dependents)] * pages_before
+        monkeypatch.setattr("ghtopdep.cli.get_max_deps", Mock(return_value=30))
+        _stub_scraping_session(monkeypatch, Mock(get=Mock(side_effect=[*pages, exc])))
+
+        result = cli_runner.invoke(
+            cli, ["https://github.com/test/repo", "--json"], catch_exceptions=False
+        )
 
-            mock_response = Mock()
-            mock_response.status_code = 200
-            mock_response.text = "<html></html>"
-            mock_response.raise_for_status = lambda: None
-            mock_session.get.return_value = mock_response
+        assert result.exit_code == 0
+        assert warning in result.stderr
+        assert json.loads(result.stdout) == expected
 
-            mock_parser_class.side_effect = Exception("Parse error")
+    def test_scraping_loop_html_parse_error(
+        self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test handling of HTML parsing error."""
+        monkeypatch.setattr("ghtopdep.cli.get_max_deps", Mock(return_value=30))
+        _stub_scraping_session(
+            monkeypatch, Mock(get=Mock(return_value=FakeResponse("<html></html>")))
+        )
+        monkeypatch.setattr(
+            "ghtopdep.cli.HTMLParser", Mock(side_effect=Exception("Parse error"))
+        )
 
-            result = runner.invoke(cli, ["https://github.com/test/repo"])
+        result = cli_runner.invoke(
+            cli, ["https://github.com/test/repo", "--json"], catch_exceptions=False
+        )
 
-            # Should handle gracefully
-            assert result.exit_code == 0 or "Warning" in result.output
+        assert result.exit_code == 0
+        assert "Warning: Failed to parse HTML on page 1: Parse error" in result.stderr
+        assert json.loads(result.stdout) == []
 
 
 class TestSearchCodeErrorHandling:
     """Tests for search code API error handling."""
 
-    def test_search_invalid_url_parsing(self) -> None:
-        """Test handling of invalid URL during search."""
-        gh = Mock()
-        gh.search_code.return_value = []
+    @staticmethod
+    def _invoke_search(
+        cli_runner: CliRunner,
+        monkeypatch: pytest.MonkeyPatch,
+        gh: Mock,
+        href: str,
+    ) -> Result:
+        """Scrape one dependent linking to ``href``, then run --search on it."""
+        page = (
+            '<div id="dependents"><div class="Box"><div class="flex-items-center">'
+            f'<img class="avatar"><span><a class="text-bold" href="{href}">dep</a>'
+            "</span><div><span>5</span></div></div></div></div>"
+        )
+        monkeypatch.setattr("github3.login", Mock(return_value=gh))
+        monkeypatch.setattr("ghtopdep.cli.CacheControl", Mock())
+        monkeypatch.setattr("ghtopdep.cli.get_max_deps", Mock(return_value=1))
+        _stub_scraping_session(
+            monkeypatch, Mock(get=Mock(return_value=FakeResponse(page)))
+        )
+
+        return cli_runner.invoke(
+            cli,
+            ["https://github.com/test/repo", "--search", "foo", "--token", "t"],
+            catch_exceptions=False,
+        )
 
-        # This would be called in the search loop
-        # Function should handle gracefully with empty URL
-        # Example: {"url": "", "stars": 100}
+    def test_search_invalid_url_parsing(
+        self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch, gh_mock: Mock
+    ) -> None:
+        """Test that a dependent URL without a path is skipped with a warning."""
+        result = self._invoke_search(cli_runner, monkeypatch, gh_mock, "/")
 
-    def test_search_api_exception(self) -> None:
-        """Test handling of search API exceptions."""
-        gh = Mock()
-        gh.search_code.side_effect = Exception("API Rate Limit Exceeded")
+        assert result.exit_code == 0
+        assert "Warning: Could not extract path from repo URL" in result.stderr
+        gh_mock.search_code.assert_not_called()
 
-        # Search code should catch this and continue with next repo
-        # This would be in the CLI function
+    def test_search_api_exception(
+        self, cli_runner: CliRunner, monkeypatch: pytest.MonkeyPatch, gh_mock: Mock
+    ) -> None:
+        """Test that a failing search is reported and the run still succeeds."""
+        gh_mock.search_code.side_effect = Exception("API Rate Limit Exceeded")
+
+        result = self._invoke_search(cli_runner, monkeypatch, gh_mock, "/user1/repo1")
+
+        assert result.exit_code == 0
+        assert (
+            "Warning: GitHub API search failed for user1/repo1: API Rate Limit Exceeded"
+            in result.stderr
+        )
+        gh_mock.search_code.assert_called_once_with("foo repo:user1/repo1")
@@ -3,10 +3,11 @@
 from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
 import requests
 from click.testing import CliRunner
 
-from ghtopdep.cli import cli
+from ghtopdep.cli import ITEM_SELECTOR, REPO_SELECTOR, STARS_SELECTOR, cli
 
 
 class TestEndToEndErrorHandling:
@@ -99,6 +100,7 @@ class TestAPIFailureRecovery:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -118,7 +120,7 @@ class TestAPIFailureRecovery:
             patch("ghtopdep.cli.requests.session") as mock_session_class,
             patch("ghtopdep.cli.get_max_deps") as mock_max_deps,
             patch("ghtopdep.cli.HTMLParser") as mock_parser_class,
-            patch("ghtopdep.cli.github3.login") as mock_login,
+            patch("github3.login") as mock_login,
             patch("ghtopdep.cli.CacheControl"),
         ):
             mock_session = MagicMock()
@@ -128,6 +130,7 @@ class TestAPIFailureRecovery:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -166,6 +169,7 @@ class TestTimeoutHandling:
         response.status_code = 200
         response.raise_for_status = MagicMock()
         response.text = "<html></html>"
+        response.content = response.text.encode()
         sess.get.return_value = response
 
         with patch("ghtopdep.cli.HTMLParser") as mock_parser:
@@ -199,6 +203,7 @@ class TestTimeoutHandling:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -239,6 +244,7 @@ class TestPaginationErrorHandling:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -275,6 +281,7 @@ class TestPaginationErrorHandling:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -295,7 +302,8 @@ class TestPaginationErrorHandling:
 class TestDataValidationErrorHandling:
     """Tests for data validation error handling."""
 
-    def test_invalid_star_count_is_skipped(self) -> None:
+    @pytest.mark.parametrize("stars", ["not-a-number", "1.2k", "12abc"])
+    def test_invalid_star_count_is_skipped(self, stars: str) -> None:
         """Test that items with invalid star counts are skipped."""
         runner = CliRunner()
 
@@ -310,6 +318,7 @@ class TestDataValidationErrorHandling:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -319,13 +328,13 @@ class TestDataValidationErrorHandling:
                 # Mock dependent with invalid stars
                 mock_dep = MagicMock()
                 mock_star_elem = MagicMock()
-                mock_star_elem.text.return_value = "not-a-number"
-                mock_dep.css.side_effect = (
-                    lambda sel: [mock_star_elem] if "STARS" in sel else []
+                mock_star_elem.text.return_value = stars
+                mock_dep.css_first.side_effect = (
+                    lambda sel, **kw: mock_star_elem if sel == STARS_SELECTOR else None
                 )
 
                 mock_parser_instance.css.side_effect = (
-                    lambda sel: [mock_dep] if "ITEM" in sel else []
+                    lambda sel: [mock_dep] if sel == ITEM_SELECTOR else []
                 )
                 mock_parser_instance.css_first.return_value = None
                 mock_parser.return_value = mock_parser_instance
@@ -334,6 +343,7 @@ class TestDataValidationErrorHandling:
 
                 # Should skip invalid item and continue
                 assert result.exit_code == 0
+                assert f"Could not parse star count '{stars}'" in result.output
 
     def test_missing_url_attribute_is_handled(self) -> None:
         """Test that missing URL attributes are handled gracefully."""
@@ -350,6 +360,7 @@ class TestDataValidationErrorHandling:
             mock_response = MagicMock()
             mock_response.status_code = 200
             mock_response.text = "<html></html>"
+            mock_response.content = mock_response.text.encode()
             mock_response.raise_for_status = MagicMock()
             mock_session.get.return_value = mock_response
 
@@ -361,18 +372,18 @@ class TestDataValidationErrorHandling:
                 mock_star_elem = MagicMock()
                 mock_star_elem.text.return_value = "100"
 
-                def css_side_effect(sel: Any) -> list[Any]:
-                    if "STARS" in sel:
-                        return [mock_star_elem]
-                    elif "REPO" in sel:
+                def css_first_side_effect(sel: Any, **kw: Any) -> Any:
+                    if sel == STARS_SELECTOR:
+                        return mock_star_elem
+                    elif sel == REPO_SELECTOR:
                         # Return element without href attribute
-                        return [MagicMock(attributes={})]
-                    return []
+                        return MagicMock(attributes={})
+                    return None
 
-                mock_dep.css.side_effect = css_side_effect
+                mock_dep.css_first.side_effect = css_first_side_effect
 
                 mock_parser_instance.css.side_effect = (
-                    lambda sel: [mock_dep] if "ITEM" in sel else []
+                    lambda sel: [mock_dep] if sel == ITEM_SELECTOR else []
                 )
                 mock_parser_instance.css_first.return_value = None
                 mock_parser.return_value = mock_parser_instance
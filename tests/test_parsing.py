@@ -3,11 +3,18 @@
 import calendar
 import datetime
 from email.utils import formatdate, parsedate
-from unittest.mock import MagicMock, Mock
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 import pytest
 
-from ghtopdep.cli import OneDayHeuristic, fetch_description, get_max_deps, show_result
+from ghtopdep.cli import (
+    OneDayHeuristic,
+    fetch_description,
+    get_max_deps,
+    show_result,
+)
+from tests.conftest import FakeResponse
 
 
 class TestGetMaxDeps:
@@ -16,9 +23,7 @@ class TestGetMaxDeps:
     def test_get_max_deps_single_digit(self, html_response_dependents: str) -> None:
         """Test extracting max dependencies from HTML."""
         mock_session = Mock()
-        mock_response = Mock()
-        mock_response.text = html_response_dependents
-        mock_session.get.return_value = mock_response
+        mock_session.get.return_value = FakeResponse(html_response_dependents)
 
         result = get_max_deps(
             mock_session, "https://github.com/test/repo/network/dependents"
@@ -37,9 +42,7 @@ class TestGetMaxDeps:
         </html>
         """
         mock_session = Mock()
-        mock_response = Mock()
-        mock_response.text = html
-        mock_session.get.return_value = mock_response
+        mock_session.get.return_value = FakeResponse(html)
 
         result = get_max_deps(
             mock_session, "https://github.com/test/repo/network/dependents"
@@ -58,44 +61,129 @@ class TestGetMaxDeps:
         </html>
         """
         mock_session = Mock()
-        mock_response = Mock()
-        mock_response.text = html
-        mock_session.get.return_value = mock_response
+        mock_session.get.return_value = FakeResponse(html)
 
         url = "https://github.com/test/repo/network/dependents"
         get_max_deps(mock_session, url)
         mock_session.get.assert_called_once_with(url, timeout=30)
 
+    def test_get_max_deps_counter_inside_full_page(self) -> None:
+        """Test the counter is found among icons and unrelated page markup."""
+        html = """
+        <html>
+            <body>
+                <div class="Box"><a class="btn-link selected">999 unrelated</a></div>
+                <div id="dependents">
+                    <div class="table-list-header-toggle states flex-auto pl-0">
+                        <a class="btn-link selected" href="?dependent_type=REPOSITORY">
+                            <svg class="octicon octicon-code-square"><path d="M0"></path></svg>
+                            1,234
+                            Repositories
+                        </a>
+                        <a class="btn-link" href="?dependent_type=PACKAGE">
+                            <svg class="octicon octicon-package"><path d="M0"></path></svg>
+                            56
+                            Packages
+                        </a>
+                    </div>
+                    <div class="Box"></div>
+                </div>
+            </body>
+        </html>
+        """
+        mock_session = Mock()
+        mock_session.get.return_value = FakeResponse(html)
+
+        result = get_max_deps(
+            mock_session, "https://github.com/test/repo/network/dependents"
+        )
+        assert result == 1234
+
+    def test_get_max_deps_nested_div_in_header_toggle(self) -> None:
+        """Test a nested div inside the header toggle doesn't hide the counter."""
+        html = """
+        <html>
+            <body>
+                <div class="table-list-header-toggle states flex-auto pl-0">
+                    <div class="d-inline-flex"></div>
+                    <a class="btn-link selected" href="?dependent_type=REPOSITORY">
+                        1,234 Repositories
+                    </a>
+                </div>
+            </body>
+        </html>
+        """
+        mock_session = Mock()
+        mock_session.get.return_value = FakeResponse(html)
+
+        result = get_max_deps(
+            mock_session, "https://github.com/test/repo/network/dependents"
+        )
+        assert result == 1234
+
+    def test_get_max_deps_reads_counter_without_parser(
+        self, html_response_dependents: str
+    ) -> None:
+        """Test a well-formed counter is read without building an HTML tree."""
+        mock_session = Mock()
+        mock_session.get.return_value = FakeResponse(html_response_dependents)
+
+        with patch("ghtopdep.cli.HTMLParser") as parser:
+            result = get_max_deps(
+                mock_session, "https://github.com/test/repo/network/dependents"
+            )
+
+        assert result == 30
+        parser.assert_not_called()
+
+    def test_get_max_deps_parses_page_when_scan_misses(self) -> None:
+        """Test a counter the regex can't read is found by parsing the page."""
+        html = """
+        <html>
+            <body>
+                <div class="Box"><a class="btn-link selected">999 unrelated</a></div>
+                <div class="table-list-header-toggle">
+                    <a class="selected btn-link" href="?dependent_type=REPOSITORY">
+                        42 Repositories
+                    </a>
+                </div>
+            </body>
+        </html>
+        """
+        mock_session = Mock()
+        mock_session.get.return_value = FakeResponse(html)
+
+        result = get_max_deps(
+            mock_session, "https://github.com/test/repo/network/dependents"
+        )
+        assert result == 42
+
 
 class TestFetchDescription:
     """Tests for the fetch_description function."""
 
     def test_fetch_description_success(self) -> None:
         """Test successful description fetch."""
-        gh = MagicMock()
-        repo = MagicMock()
-        repo.description = "This is a test repository"
-        gh.repository.return_value = repo
+        gh = Mock()
+        gh.repository.return_value = SimpleNamespace(
+            description="This is a test repository"
+        )
 
         result = fetch_description(gh, "/owner/repo")
         assert "test repository" in result
 
     def test_fetch_description_empty_description(self) -> None:
         """Test when repository has no description."""
-        gh = MagicMock()
-        repo = MagicMock()
-        repo.description = None
-        gh.repository.return_value = repo
+        gh = Mock()
+        gh.repository.return_value = SimpleNamespace(description=None)
 
         result = fetch_description(gh, "/owner/repo")
         assert result == " "
 
     def test_fetch_description_long_description(self) -> None:
         """Test that long descriptions are truncated."""
-        gh = MagicMock()
-        repo = MagicMock()
-        repo.description = "a" * 100
-        gh.repository.return_value = repo
+        gh = Mock()
+        gh.repository.return_value = SimpleNamespace(description="a" * 100)
 
         result = fetch_description(gh, "/owner/repo")
         # textwrap.shorten should truncate to 60 chars
@@ -103,10 +191,8 @@ class TestFetchDescription:
 
     def test_fetch_description_parses_url_correctly(self) -> None:
         """Test that URL is parsed correctly to extract owner and repo."""
-        gh = MagicMock()
-        repo = MagicMock()
-        repo.description = "Test"
-        gh.repository.return_value = repo
+        gh = Mock()
+        gh.repository.return_value = SimpleNamespace(description="Test")
 
         fetch_description(gh, "/myowner/myrepo")
         gh.repository.assert_called_once_with("myowner", "myrepo")
@@ -119,25 +205,19 @@ class TestOneDayHeuristic:
     def _create_response_with_date(
         status: int = 200,
         date_tuple: tuple[int, int, int, int, int, int] = (2024, 1, 1, 12, 0, 0),
-    ) -> Mock:
+    ) -> SimpleNamespace:
         """
-        Helper method to create a mock response with date header.
+        Helper method to create a stand-in response with date header.
 
         Args:
             status: HTTP status code (default: 200)
             date_tuple: Date as tuple (year, month, day, hour, min, sec)
 
         Returns:
-            Mock response object with status and date header
+            Response stand-in with status and date header
         """
-        response = Mock()
-        response.status = status
-        response.headers = {
-            "date": formatdate(
-                calendar.timegm(datetime.datetime(*date_tuple).timetuple())
-            )
-        }
-        return response
+        date = formatdate(calendar.timegm(datetime.datetime(*date_tuple).timetuple()))
+        return SimpleNamespace(status=status, headers={"date": date})
 
     def test_one_day_heuristic_cacheable_status(self) -> None:
         """Test that cacheable statuses are handled correctly."""
@@ -153,9 +233,9 @@ class TestOneDayHeuristic:
         """Test that non-cacheable statuses are ignored."""
         heuristic = OneDayHeuristic()
 
-        response = Mock()
-        response.status = 500
-        response.headers = {"date": "Mon, 01 Jan 2024 12:00:00 GMT"}
+        response = SimpleNamespace(
+            status=500, headers={"date": "Mon, 01 Jan 2024 12:00:00 GMT"}
+        )
 
         result = heuristic.update_headers(response)
         assert result == {}
@@ -180,9 +260,7 @@ class TestOneDayHeuristic:
         test_date = datetime.datetime(2024, 1, 1, 12, 0, 0)
         date_str = formatdate(calendar.timegm(test_date.timetuple()))
 
-        response = Mock()
-        response.status = 200
-        response.headers = {"date": date_str}
+        response = SimpleNamespace(status=200, headers={"date": date_str})
 
         result = heuristic.update_headers(response)
 
@@ -199,11 +277,23 @@ class TestOneDayHeuristic:
         """Test that warning message is returned."""
         heuristic = OneDayHeuristic()
 
-        response = Mock()
-        warning = heuristic.warning(response)
+        warning = heuristic.warning(SimpleNamespace())
         assert "Stale" in warning
         assert "110 - " in warning
 
+    def test_one_day_heuristic_reuses_expiry_for_same_date(self) -> None:
+        """Test that a repeated date header is not parsed again."""
+        heuristic = OneDayHeuristic()
+        response = self._create_response_with_date()
+
+        with patch("ghtopdep.cli.parsedate", wraps=parsedate) as parse:
+            first = heuristic.update_headers(response)
+            second = heuristic.update_headers(response)
+
+        assert first == second
+        assert first is not second
+        parse.assert_called_once()
+
 
 class TestShowResult:
     """Tests for the show_result function."""
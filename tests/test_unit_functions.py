@@ -3,8 +3,13 @@
 import time
 from typing import Any
 
+import pytest
+
 from ghtopdep.cli import already_added, humanize, readable_stars, sort_repos
 
+# Unique repo URLs shared by the lookup tests; slices take the first N
+_URLS = tuple(f"https://github.com/user{i}/repo{i}" for i in range(5000))
+
 
 class TestHumanize:
     """Tests for the humanize function."""
@@ -112,6 +117,19 @@ class TestSortRepos:
         assert result[1]["stars"] == 100
         assert result[2]["stars"] == 50
 
+    def test_sort_repos_limited_ties_keep_input_order(self) -> None:
+        """Test that a row limit keeps tied repos in their scraped order."""
+        repos = [
+            {"url": "https://github.com/user1/repo1", "stars": 50},
+            {"url": "https://github.com/user2/repo2", "stars": 100},
+            {"url": "https://github.com/user3/repo3", "stars": 100},
+        ]
+        result = sort_repos(repos, 2)
+        assert [repo["url"] for repo in result] == [
+            "https://github.com/user2/repo2",
+            "https://github.com/user3/repo3",
+        ]
+
 
 class TestReadableStars:
     """Tests for the readable_stars function."""
@@ -183,8 +201,7 @@ class TestSetBasedDuplicateDetection:
 
     def test_set_based_lookup_performance(self) -> None:
         """Test that set-based lookup is O(1) vs O(n) for already_added."""
-        # Generate 1000 unique URLs
-        urls = [f"https://github.com/user{i}/repo{i}" for i in range(1000)]
+        urls = _URLS[:1000]
 
         # Test set-based approach
         seen_urls = set(urls)
@@ -218,6 +235,7 @@ class TestSetBasedDuplicateDetection:
         assert main_url not in {repo["url"] for repo in repos}
 
 
+@pytest.mark.perf
 class TestPerformanceBenchmark:
     """Benchmark tests comparing set-based vs list-based duplicate detection."""
 
@@ -228,8 +246,7 @@ class TestPerformanceBenchmark:
         This test demonstrates that set-based lookup maintains constant time
         regardless of collection size, while list-based lookup degrades to O(n).
         """
-        # Generate test URLs
-        urls = [f"https://github.com/user{i}/repo{i}" for i in range(1000)]
+        urls = _URLS[:1000]
 
         # Test set-based approach (should be very fast)
         start_time = time.perf_counter()
@@ -257,8 +274,8 @@ class TestPerformanceBenchmark:
 
         With 10,000 items, the performance difference becomes even more pronounced.
         """
-        urls_small = [f"https://github.com/user{i}/repo{i}" for i in range(100)]
-        urls_large = [f"https://github.com/user{i}/repo{i}" for i in range(5000)]
+        urls_small = _URLS[:100]
+        urls_large = _URLS
 
         # Test with small set
         set_small = set(urls_small)
@@ -176,33 +176,37 @@ class TestValidateGithubUrl:
         assert owner == "user"
         assert repo == "repo"
 
-    def test_special_characters_in_owner(
-        self, capsys: pytest.CaptureFixture[str]
-    ) -> None:
-        """Test various special characters that should fail."""
-        invalid_urls = [
+    @pytest.mark.parametrize(
+        "url",
+        [
             "https://github.com/user!/repo",
             "https://github.com/user#/repo",
             "https://github.com/user$/repo",
             "https://github.com/user%/repo",
-        ]
-        for url in invalid_urls:
-            with pytest.raises(SystemExit):
-                validate_github_url(url)
-            captured = capsys.readouterr()
-            assert "Error:" in captured.err
-
-    def test_special_characters_in_repo(
-        self, capsys: pytest.CaptureFixture[str]
+        ],
+    )
+    def test_special_characters_in_owner(
+        self, url: str, capsys: pytest.CaptureFixture[str]
     ) -> None:
-        """Test various special characters in repo that should fail."""
-        invalid_urls = [
+        """Test various special characters that should fail."""
+        with pytest.raises(SystemExit):
+            validate_github_url(url)
+        captured = capsys.readouterr()
+        assert "Error:" in captured.err
+
+    @pytest.mark.parametrize(
+        "url",
+        [
             "https://github.com/user/repo!",
             "https://github.com/user/repo$",
             "https://github.com/user/repo%",
-        ]
-        for url in invalid_urls:
-            with pytest.raises(SystemExit):
-                validate_github_url(url)
-            captured = capsys.readouterr()
-            assert "Error: Invalid repository name" in captured.err
+        ],
+    )
+    def test_special_characters_in_repo(
+        self, url: str, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        """Test various special characters in repo that should fail."""
+        with pytest.raises(SystemExit):
+            validate_github_url(url)
+        captured = capsys.readouterr()
+        assert "Error: Invalid repository name" in captured.err